@@ -0,0 +1,14 @@
+import re
+
+# Who is calling, from the claims the Cognito authorizer puts on the request
+ADMIN_GROUP = 'Admins'
+
+
+def caller_groups(event):
+    claims = ((event.get('requestContext') or {}).get('authorizer') or {}).get('claims') or {}
+    # REST APIs pass the groups as "A,B"; HTTP APIs as "[A B]"
+    return {group for group in re.split(r'[\[\],\s]+', claims.get('cognito:groups') or '') if group}
+
+
+def is_admin(event):
+    return ADMIN_GROUP in caller_groups(event)
@@ -0,0 +1,35 @@
+import threading
+
+# Shared boto3 clients. Each one is created on first use, so a request rejected before it
+# touches AWS pays nothing for it, and then kept for the container's lifetime so warm
+# invocations reuse the same connection pool. boto3 itself is imported on first use too, which
+# keeps it off the import path of code running against the local SQLite backend.
+CLIENT_CONFIG_OPTIONS = {
+    'connect_timeout': 5,
+    'read_timeout': 30,
+    'tcp_keepalive': True,
+    'retries': {'max_attempts': 3, 'mode': 'standard'}
+}
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client(service_name):
+    client = _clients.get(service_name)
+    if client is None:
+        # Client creation is not thread safe, and the SQS consumer calls in from a thread pool
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                import boto3
+                from botocore.config import Config
+                client = boto3.client(service_name, config=Config(**CLIENT_CONFIG_OPTIONS))
+                _clients[service_name] = client
+    return client
+
+
+def register_client(service_name, client):
+    # Lets local tooling swap in a stand-in (for example an in-memory SNS) before handlers run
+    with _lock:
+        _clients[service_name] = client
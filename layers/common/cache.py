@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after ttl_seconds.
+
+    Instances are meant to live at module scope so they survive warm invocations.
+    """
+
+    def __init__(self, max_size, ttl_seconds):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_many(self, keys):
+        hits = {}
+        misses = []
+        for key in keys:
+            value = self.get(key)
+            if value is None:
+                misses.append(key)
+            else:
+                hits[key] = value
+        return hits, misses
+
+    def set(self, key, value):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,104 @@
+import os
+from awsClients import get_client
+
+# Shared database client, created on the first query and reused by every handler for the rest of
+# the container's life. DB_BACKEND picks the Data API (default), a pooled native MySQL connection
+# or the local SQLite emulator; all three expose the same interface.
+db_backend = os.environ.get('DB_BACKEND', 'data-api')
+_db_client = None
+
+# Only the Data API needs the cluster and secret ARNs, so the local backends run without them
+cluster_arn = os.environ.get('CLUSTER_ARN', '')
+secret_arn = os.environ.get('SECRET_ARN', '')
+database_name = os.environ.get('DB_NAME', '')
+
+# Tables known to exist, filled by a single SHOW TABLES and kept for the container's lifetime
+_known_tables = None
+
+
+def get_db_client():
+    global _db_client
+    if _db_client is None:
+        if db_backend == 'mysql':
+            from mysqlBackend import MySqlClient
+            _db_client = MySqlClient()
+        elif db_backend == 'sqlite':
+            from sqliteBackend import SqliteClient
+            _db_client = SqliteClient()
+        else:
+            _db_client = get_client('rds-data')
+    return _db_client
+
+
+def execute_statement(sql, parameters=None, **kwargs):
+    if parameters:
+        kwargs['parameters'] = parameters
+    return get_db_client().execute_statement(
+        resourceArn=cluster_arn,
+        secretArn=secret_arn,
+        database=database_name,
+        sql=sql,
+        **kwargs
+    )
+
+
+def field_value(field):
+    # Data API fields are single-key dicts such as {'longValue': 1} or {'isNull': True}
+    if field.get('isNull'):
+        return None
+    return next(iter(field.values()))
+
+
+def load_tables():
+    global _known_tables
+    try:
+        response = execute_statement("SHOW TABLES;")
+        _known_tables = {record[0]['stringValue'] for record in response['records']}
+        return _known_tables
+    except Exception as e:
+        print(f"Error loading table list: {str(e)}")
+        raise
+
+
+def table_exists(table_name):
+    # Tables are never dropped at runtime, so a positive answer is cached; a miss
+    # reloads the list in case initializeDatabase ran after this container started.
+    if _known_tables is not None and table_name in _known_tables:
+        return True
+    return table_name in load_tables()
+
+
+def begin_transaction():
+    response = get_db_client().begin_transaction(
+        resourceArn=cluster_arn,
+        secretArn=secret_arn,
+        database=database_name
+    )
+    return response['transactionId']
+
+
+def commit_transaction(transaction_id):
+    get_db_client().commit_transaction(
+        resourceArn=cluster_arn,
+        secretArn=secret_arn,
+        transactionId=transaction_id
+    )
+
+
+def rollback_transaction(transaction_id):
+    get_db_client().rollback_transaction(
+        resourceArn=cluster_arn,
+        secretArn=secret_arn,
+        transactionId=transaction_id
+    )
+
+
+def batch_execute_statement(sql, parameter_sets, **kwargs):
+    return get_db_client().batch_execute_statement(
+        resourceArn=cluster_arn,
+        secretArn=secret_arn,
+        database=database_name,
+        sql=sql,
+        parameterSets=parameter_sets,
+        **kwargs
+    )
@@ -0,0 +1,34 @@
+import datetime
+import decimal
+
+# Conversions between Data API typed values ({'longValue': 1}, {'isNull': True}...) and Python
+# values, shared by the backends that stand in for the rds-data client.
+
+
+def to_python(value):
+    if value.get('isNull'):
+        return None
+    if 'arrayValue' in value:
+        raise ValueError('Array parameters are not supported by this backend.')
+    return next(iter(value.values()))
+
+
+def to_field(value):
+    # Mirrors the Data API: DECIMAL and temporal columns come back as strings
+    if value is None:
+        return {'isNull': True}
+    if isinstance(value, bool):
+        return {'booleanValue': value}
+    if isinstance(value, int):
+        return {'longValue': value}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, decimal.Decimal):
+        return {'stringValue': str(value)}
+    if isinstance(value, datetime.datetime):
+        return {'stringValue': value.strftime('%Y-%m-%d %H:%M:%S')}
+    if isinstance(value, (datetime.date, datetime.timedelta)):
+        return {'stringValue': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {'blobValue': bytes(value)}
+    return {'stringValue': str(value)}
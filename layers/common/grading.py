@@ -0,0 +1,118 @@
+import json
+import re
+import unicodedata
+
+# Answer grading keyed on Questions.type. compile_answer_key turns a stored answer into a grader
+# once; the grader takes the candidate's answer and returns the credit earned, from 0.0 to 1.0.
+# Callers cache graders with their questions, so grading a quiz is one call per response with
+# no JSON parsing or key normalization on the hot path.
+
+NUMERIC_EPSILON = 1e-9
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_EDGE_PUNCTUATION = '.,;:!?"\'`'
+
+
+def _hashable(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+def normalize_text(value):
+    text = unicodedata.normalize('NFKC', str(value)).casefold()
+    return _WHITESPACE_PATTERN.sub(' ', text).strip().strip(_EDGE_PUNCTUATION).strip()
+
+
+def compile_exact(answer):
+    return lambda response: 1.0 if response == answer else 0.0
+
+
+def compile_multi_select(answer):
+    # Order does not matter; each right option earns credit and each wrong one takes it back
+    correct = frozenset(_hashable(option) for option in (answer if isinstance(answer, list) else [answer]))
+
+    def grade(response):
+        selected = {_hashable(option) for option in (response if isinstance(response, list) else [response])}
+        if not correct:
+            return 0.0 if selected else 1.0
+        hits = len(selected & correct)
+        return max(0.0, (hits - len(selected - correct)) / len(correct))
+    return grade
+
+
+def compile_ordered(answer):
+    # Credit for each item in its right position
+    expected = tuple(_hashable(item) for item in answer)
+
+    def grade(response):
+        if not isinstance(response, list) or not expected:
+            return 0.0
+        matches = sum(1 for position, item in enumerate(response[:len(expected)]) if _hashable(item) == expected[position])
+        return matches / len(expected)
+    return grade
+
+
+def compile_numeric(answer):
+    # Either a number or {"value": 3.14, "tolerance": 0.01}
+    if isinstance(answer, dict):
+        value, tolerance = float(answer['value']), float(answer.get('tolerance', 0))
+    else:
+        value, tolerance = float(answer), 0.0
+    tolerance += NUMERIC_EPSILON
+
+    def grade(response):
+        try:
+            return 1.0 if abs(float(response) - value) <= tolerance else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+    return grade
+
+
+def compile_free_text(answer):
+    # One accepted answer or a list of them, compared ignoring case, spacing and edge punctuation
+    accepted = frozenset(normalize_text(option) for option in (answer if isinstance(answer, list) else [answer]))
+
+    def grade(response):
+        if response is None or isinstance(response, (list, dict)):
+            return 0.0
+        return 1.0 if normalize_text(response) in accepted else 0.0
+    return grade
+
+
+GRADERS = {
+    'single-choice': compile_exact,
+    'multi-select': compile_multi_select,
+    'ordered': compile_ordered,
+    'numeric': compile_numeric,
+    'free-text': compile_free_text
+}
+
+TYPE_ALIASES = {
+    'single': 'single-choice',
+    'true-false': 'single-choice',
+    'multiple-select': 'multi-select',
+    'multi-choice': 'multi-select',
+    'checkbox': 'multi-select',
+    'ordering': 'ordered',
+    'number': 'numeric',
+    'text': 'free-text',
+    'short-answer': 'free-text'
+}
+
+
+def grader_name(question_type):
+    if not question_type:
+        return None
+    name = question_type.strip().lower().replace('_', '-').replace(' ', '-')
+    return TYPE_ALIASES.get(name, name)
+
+
+def compile_answer_key(question_type, answer):
+    # Unknown types keep the original exact comparison
+    compile_grader = GRADERS.get(grader_name(question_type), compile_exact)
+    try:
+        return compile_grader(answer)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Invalid answer key for type {question_type}, using exact comparison: {str(e)}")
+        return compile_exact(answer)
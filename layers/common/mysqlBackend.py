@@ -0,0 +1,138 @@
+import json
+import os
+import queue
+import re
+import threading
+import uuid
+
+import pymysql
+from awsClients import get_client
+from dataApiValues import to_field, to_python
+
+# Native MySQL stand-in for the rds-data client, selected with DB_BACKEND=mysql. It accepts the
+# same calls and :name parameters as the Data API and returns the same response shapes, so
+# handlers do not change. Connections are pooled at module scope and reused across warm invocations.
+
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '4'))
+
+# Quoted literals are matched first so a ':word' inside a string is left alone
+_TOKEN_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|(?<![:\w]):([A-Za-z_]\w*)|%")
+
+
+def translate_sql(sql):
+    def replace(match):
+        if match.group(0) == '%':
+            return '%%'
+        if match.group(1):
+            return f"%({match.group(1)})s"
+        return match.group(0).replace('%', '%%')
+    return _TOKEN_PATTERN.sub(replace, sql)
+
+
+class MySqlClient:
+    def __init__(self):
+        self.host = os.environ['DB_HOST']
+        self.port = int(os.environ.get('DB_PORT', '3306'))
+        self._credentials = None
+        self._pool = queue.LifoQueue(maxsize=POOL_SIZE)
+        self._transactions = {}
+        self._lock = threading.Lock()
+
+    def _get_credentials(self, secret_arn):
+        if self._credentials is None:
+            secret = get_client('secretsmanager').get_secret_value(SecretId=secret_arn)
+            self._credentials = json.loads(secret['SecretString'])
+        return self._credentials
+
+    def _connect(self, secret_arn, database):
+        credentials = self._get_credentials(secret_arn)
+        return pymysql.connect(
+            host=self.host,
+            port=self.port,
+            user=credentials['username'],
+            password=credentials['password'],
+            database=database,
+            autocommit=True,
+            connect_timeout=5
+        )
+
+    def _acquire(self, secret_arn, database):
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect(secret_arn, database)
+        try:
+            connection.ping(reconnect=True)
+            return connection
+        except pymysql.MySQLError:
+            connection.close()
+            return self._connect(secret_arn, database)
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _run(self, connection, sql, parameters, include_metadata):
+        with connection.cursor() as cursor:
+            cursor.execute(translate_sql(sql), {p['name']: to_python(p['value']) for p in parameters})
+            response = {'numberOfRecordsUpdated': 0 if cursor.description else cursor.rowcount}
+            if cursor.description:
+                response['records'] = [[to_field(value) for value in row] for row in cursor.fetchall()]
+                if include_metadata:
+                    response['columnMetadata'] = [{'name': column[0], 'label': column[0]} for column in cursor.description]
+            else:
+                response['records'] = []
+                response['generatedFields'] = [{'longValue': cursor.lastrowid}] if cursor.lastrowid else []
+            return response
+
+    def execute_statement(self, resourceArn, secretArn, sql, database=None, parameters=None,
+                          transactionId=None, includeResultMetadata=False, **kwargs):
+        if transactionId:
+            return self._run(self._transactions[transactionId], sql, parameters or [], includeResultMetadata)
+
+        connection = self._acquire(secretArn, database)
+        try:
+            return self._run(connection, sql, parameters or [], includeResultMetadata)
+        finally:
+            self._release(connection)
+
+    def batch_execute_statement(self, resourceArn, secretArn, sql, database=None, parameterSets=None,
+                                transactionId=None, **kwargs):
+        parameter_sets = parameterSets or []
+        rows = [{p['name']: to_python(p['value']) for p in parameter_set} for parameter_set in parameter_sets]
+        connection = self._transactions[transactionId] if transactionId else self._acquire(secretArn, database)
+        try:
+            with connection.cursor() as cursor:
+                cursor.executemany(translate_sql(sql), rows)
+            return {'updateResults': [{'generatedFields': []} for _ in rows]}
+        finally:
+            if not transactionId:
+                self._release(connection)
+
+    def begin_transaction(self, resourceArn, secretArn, database=None, **kwargs):
+        connection = self._acquire(secretArn, database)
+        connection.begin()
+        transaction_id = str(uuid.uuid4())
+        with self._lock:
+            self._transactions[transaction_id] = connection
+        return {'transactionId': transaction_id}
+
+    def commit_transaction(self, resourceArn, secretArn, transactionId):
+        with self._lock:
+            connection = self._transactions.pop(transactionId)
+        try:
+            connection.commit()
+        finally:
+            self._release(connection)
+        return {'transactionStatus': 'Transaction Committed'}
+
+    def rollback_transaction(self, resourceArn, secretArn, transactionId):
+        with self._lock:
+            connection = self._transactions.pop(transactionId)
+        try:
+            connection.rollback()
+        finally:
+            self._release(connection)
+        return {'transactionStatus': 'Rollback Complete'}
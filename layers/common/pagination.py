@@ -0,0 +1,73 @@
+from dataAccess import execute_statement
+from resultMapper import map_records
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def list_rows(table, id_column, columns, query, filters=None, json_columns=(), extra_columns=()):
+    """Return one keyset-paginated page of a table.
+
+    query is the API Gateway queryStringParameters dict: limit, after (the
+    nextCursor of the previous page), fields (comma separated) and any of the
+    filter columns. filters maps each filterable column to its Data API value
+    type. extra_columns are only returned when named in fields. Raises
+    ValueError for invalid parameters.
+    """
+    query = query or {}
+    filters = filters or {}
+    fields = parse_fields(query.get('fields'), columns, id_column, extra_columns)
+    limit = parse_int(query.get('limit'), 'limit', DEFAULT_LIMIT)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_LIMIT}.')
+    after = parse_int(query.get('after'), 'after', None)
+
+    conditions = []
+    parameters = []
+    for column, value_type in filters.items():
+        value = query.get(column)
+        if value is None:
+            continue
+        if value_type == 'longValue':
+            value = parse_int(value, column, None)
+        conditions.append(f"{column} = :{column}")
+        parameters.append({'name': column, 'value': {value_type: value}})
+
+    if after is not None:
+        conditions.append(f"{id_column} > :after")
+        parameters.append({'name': 'after', 'value': {'longValue': after}})
+
+    # One extra row tells us whether another page exists without a COUNT query
+    parameters.append({'name': 'limit', 'value': {'longValue': limit + 1}})
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    sql = f"SELECT {', '.join(fields)} FROM {table}{where} ORDER BY {id_column} LIMIT :limit"
+
+    response = execute_statement(sql=sql, parameters=parameters)
+    records = response['records']
+
+    items = map_records(records[:limit], tuple(fields), json_columns)
+
+    next_cursor = items[-1][id_column] if len(records) > limit else None
+    return {'items': items, 'nextCursor': next_cursor}
+
+
+def parse_fields(requested, columns, id_column, extra_columns=()):
+    if not requested:
+        return list(columns)
+    fields = [field.strip() for field in requested.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in columns and field not in extra_columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    # The id is always returned because it is the pagination cursor
+    if id_column not in fields:
+        fields.insert(0, id_column)
+    return fields
+
+
+def parse_int(value, name, default):
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer.')
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from awsClients import get_client
+from dataAccess import batch_execute_statement
+from quizSessions import timestamp_parameter
+
+# Candidates receive a quiz manifest: question ids in order plus a URL per question. Each URL
+# points to an immutable JSON payload (text, type and options, never the answer) in the bucket
+# behind CloudFront. The key carries a hash of the payload, so an edited question gets a new URL
+# and edge caches never need invalidating. Questions.payloadVersion records the published hash;
+# editing a question clears it and the next quiz that uses the question publishes it again.
+# The version is only written if the row's updatedAt still matches the one read with the content,
+# so an edit landing between the read and the write leaves it unpublished rather than stale.
+# Without a bucket and domain configured (local runs), the payloads are returned inline.
+payload_bucket = os.environ.get('QUESTION_BUCKET')
+cdn_domain = os.environ.get('CLOUDFRONT_DOMAIN')
+
+PAYLOAD_PREFIX = 'questions'
+PAYLOAD_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def payloads_enabled():
+    return bool(payload_bucket and cdn_domain)
+
+
+def content_columns(alias):
+    # Text and options are only read when they are returned inline or still have to be published
+    if payloads_enabled():
+        return (f"CASE WHEN {alias}.payloadVersion IS NULL THEN {alias}.text END, "
+                f"CASE WHEN {alias}.payloadVersion IS NULL THEN {alias}.options END")
+    return f"{alias}.text, {alias}.options"
+
+
+def question_payload(question):
+    return {
+        'id': question['id'],
+        'text': question['text'],
+        'type': question['type'],
+        'options': question['options']
+    }
+
+
+def payload_version(payload):
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def payload_key(question_id, version):
+    return f"{PAYLOAD_PREFIX}/{question_id}/{version}.json"
+
+
+def publish_payloads(questions):
+    # Sets payloadVersion on the given questions once their payload is in the bucket; each
+    # question carries the updatedAt it was read with
+    try:
+        published = []
+        for question in questions:
+            payload = question_payload(question)
+            version = payload_version(payload)
+            get_client('s3').put_object(
+                Bucket=payload_bucket,
+                Key=payload_key(question['id'], version),
+                Body=json.dumps(payload).encode('utf-8'),
+                ContentType='application/json',
+                CacheControl=PAYLOAD_CACHE_CONTROL
+            )
+            question['payloadVersion'] = version
+            published.append(question)
+        if published:
+            # updatedAt is kept as is; publishing does not change the question
+            batch_execute_statement(
+                "UPDATE Questions SET payloadVersion = :version, updatedAt = updatedAt WHERE id = :id AND updatedAt = :updatedAt",
+                [
+                    [
+                        {'name': 'version', 'value': {'stringValue': question['payloadVersion']}},
+                        {'name': 'id', 'value': {'longValue': question['id']}},
+                        timestamp_parameter('updatedAt', question['updatedAt'])
+                    ]
+                    for question in published
+                ]
+            )
+    except Exception as e:
+        print(f"Error publishing question payloads: {str(e)}")
+        raise
+
+
+def quiz_manifest(questions):
+    """Questions as handed to the candidate, in quiz order and without answers."""
+    if not payloads_enabled():
+        return [dict(question_payload(question), position=position) for position, question in enumerate(questions)]
+
+    publish_payloads([question for question in questions if not question.get('payloadVersion')])
+    return [
+        {
+            'id': question['id'],
+            'position': position,
+            'version': question['payloadVersion'],
+            'url': f"https://{cdn_domain}/{payload_key(question['id'], question['payloadVersion'])}"
+        }
+        for position, question in enumerate(questions)
+    ]
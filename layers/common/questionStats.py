@@ -0,0 +1,105 @@
+from dataAccess import batch_execute_statement
+
+# Running per-question counters in QuestionStats. Serves are counted when a quiz is created and
+# answers when its result is stored, each as one batched upsert that adds to the existing row,
+# so reading a question's difficulty never touches QuizHistory or its results JSON.
+
+RECORD_SERVED_SQL = "INSERT INTO QuestionStats (questionId, timesServed) VALUES (:questionId, 1) ON DUPLICATE KEY UPDATE timesServed = timesServed + 1"
+
+RECORD_ANSWERS_SQL = "INSERT INTO QuestionStats (questionId, timesAnswered, timesCorrect, totalCredit, timedAnswers, totalAnswerSeconds) VALUES (:questionId, :answered, :correct, :credit, :timed, :seconds) ON DUPLICATE KEY UPDATE timesAnswered = timesAnswered + VALUES(timesAnswered), timesCorrect = timesCorrect + VALUES(timesCorrect), totalCredit = totalCredit + VALUES(totalCredit), timedAnswers = timedAnswers + VALUES(timedAnswers), totalAnswerSeconds = totalAnswerSeconds + VALUES(totalAnswerSeconds)"
+
+# A question needs this many answers before its correct rate decides its difficulty
+MIN_ANSWERS_FOR_DIFFICULTY = 20
+EASY_CORRECT_RATE = 0.75
+HARD_CORRECT_RATE = 0.40
+DIFFICULTIES = ('easy', 'medium', 'hard')
+# Client-reported answer times above the longest quiz timer are not plausible and are dropped
+MAX_ANSWER_SECONDS = 30 * 60
+
+
+def _transaction_kwargs(transaction_id):
+    return {'transactionId': transaction_id} if transaction_id else {}
+
+
+def answer_seconds(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if 0 <= value <= MAX_ANSWER_SECONDS else None
+
+
+def record_served(question_ids, transaction_id=None):
+    try:
+        batch_execute_statement(RECORD_SERVED_SQL, [
+            [{'name': 'questionId', 'value': {'longValue': question_id}}]
+            for question_id in question_ids
+        ], **_transaction_kwargs(transaction_id))
+    except Exception as e:
+        print(f"Error recording served questions: {str(e)}")
+        raise
+
+
+def answer_parameter_sets(results_lists):
+    # Sums every graded answer per question, so a batch of submissions is one row per question
+    totals = {}
+    for results in results_lists:
+        for result in results:
+            # Responses for questions outside the quiz carry no credit and are not counted
+            if 'credit' not in result:
+                continue
+            counters = totals.setdefault(result['questionId'], [0, 0, 0.0, 0, 0.0])
+            counters[0] += 1
+            counters[1] += 1 if result['correct'] else 0
+            counters[2] += result['credit']
+            if result.get('timeSpentSeconds') is not None:
+                counters[3] += 1
+                counters[4] += result['timeSpentSeconds']
+    return [
+        [
+            {'name': 'questionId', 'value': {'longValue': question_id}},
+            {'name': 'answered', 'value': {'longValue': answered}},
+            {'name': 'correct', 'value': {'longValue': correct}},
+            {'name': 'credit', 'value': {'doubleValue': float(credit)}},
+            {'name': 'timed', 'value': {'longValue': timed}},
+            {'name': 'seconds', 'value': {'doubleValue': float(seconds)}}
+        ]
+        # Sorted by question id so concurrent writers lock the rows in the same order
+        for question_id, (answered, correct, credit, timed, seconds) in sorted(totals.items())
+    ]
+
+
+def record_answers(results_lists, transaction_id=None):
+    parameter_sets = answer_parameter_sets(results_lists)
+    if not parameter_sets:
+        return
+    try:
+        batch_execute_statement(RECORD_ANSWERS_SQL, parameter_sets, **_transaction_kwargs(transaction_id))
+    except Exception as e:
+        print(f"Error recording question stats: {str(e)}")
+        raise
+
+
+def difficulty(times_answered, times_correct):
+    # Questions without enough answers yet count as medium
+    if not times_answered or times_answered < MIN_ANSWERS_FOR_DIFFICULTY:
+        return 'medium'
+    correct_rate = times_correct / times_answered
+    if correct_rate >= EASY_CORRECT_RATE:
+        return 'easy'
+    if correct_rate <= HARD_CORRECT_RATE:
+        return 'hard'
+    return 'medium'
+
+
+def stats_summary(times_served, times_answered, times_correct, total_credit, timed_answers, total_answer_seconds):
+    times_served = times_served or 0
+    times_answered = times_answered or 0
+    times_correct = times_correct or 0
+    return {
+        'timesServed': times_served,
+        'timesAnswered': times_answered,
+        'timesCorrect': times_correct,
+        'correctRate': round(times_correct / times_answered, 4) if times_answered else None,
+        'meanCredit': round(float(total_credit) / times_answered, 4) if times_answered else None,
+        'meanAnswerSeconds': round(float(total_answer_seconds) / timed_answers, 2) if timed_answers else None,
+        'difficulty': difficulty(times_answered, times_correct)
+    }
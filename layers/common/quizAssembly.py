@@ -0,0 +1,170 @@
+import random
+from cache import TTLCache
+from dataAccess import execute_statement
+from grading import grader_name
+from questionStats import DIFFICULTIES, difficulty
+
+# Quiz assembly against constraints: one or more profiles, an exact count per question type, a
+# difficulty mix and questions the candidate has not seen yet. Each profile's questions are kept
+# as (id, type, difficulty) entries across warm invocations, so assembling a quiz is solved in
+# memory; only profiles missing from the cache are read, all in one query.
+PROFILE_INDEX_SIZE = 200
+PROFILE_INDEX_TTL_SECONDS = 300
+profile_index = TTLCache(PROFILE_INDEX_SIZE, PROFILE_INDEX_TTL_SECONDS)
+
+# 'balanced' takes an equal share of each level
+BALANCED_MIX = {level: 1 for level in DIFFICULTIES}
+
+
+def _positive_int(value, name):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f'{name} must be a positive integer.')
+    return value
+
+
+def build_constraints(profile_ids, number_questions, types=None, mix=None):
+    """Validate the request's constraints; raises ValueError with a message for the caller's 400."""
+    if not isinstance(profile_ids, list):
+        raise ValueError('profileIds must be a list of profile IDs.')
+    profile_ids = [_positive_int(profile_id, 'Profile ID') for profile_id in profile_ids]
+    number_questions = _positive_int(number_questions, 'Number of questions')
+
+    type_counts = {}
+    if types is not None:
+        if not isinstance(types, dict):
+            raise ValueError('types must map a question type to a count.')
+        for question_type, count in types.items():
+            if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+                raise ValueError(f'Count for type {question_type} must be a non-negative integer.')
+            name = grader_name(question_type)
+            type_counts[name] = type_counts.get(name, 0) + count
+        if sum(type_counts.values()) > number_questions:
+            raise ValueError('Type counts add up to more than the number of questions.')
+
+    return {
+        'profileIds': list(dict.fromkeys(profile_ids)),
+        'numberQuestions': number_questions,
+        'typeCounts': type_counts,
+        'difficultyCounts': difficulty_counts(mix, number_questions)
+    }
+
+
+def difficulty_counts(mix, number_questions):
+    # Weights per level, e.g. {"easy": 1, "hard": 2}, become counts by largest remainder
+    if mix is None:
+        return None
+    if mix == 'balanced':
+        mix = BALANCED_MIX
+    if not isinstance(mix, dict) or not mix:
+        raise ValueError('Difficulty must be "balanced" or weights per level.')
+    for level, weight in mix.items():
+        if level not in DIFFICULTIES:
+            raise ValueError(f'Difficulty level must be one of {", ".join(DIFFICULTIES)}.')
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f'Weight for {level} must be a non-negative number.')
+    total_weight = sum(mix.values())
+    if total_weight <= 0:
+        raise ValueError('Difficulty weights must not all be zero.')
+
+    shares = {level: number_questions * mix.get(level, 0) / total_weight for level in DIFFICULTIES}
+    counts = {level: int(share) for level, share in shares.items()}
+    # Leftover questions go to the largest fractions, medium first on a tie
+    by_fraction = sorted(DIFFICULTIES, key=lambda level: (counts[level] - shares[level], level != 'medium'))
+    for level in by_fraction[:number_questions - sum(counts.values())]:
+        counts[level] += 1
+    return counts
+
+
+def load_profile_index(profile_ids, refresh=False):
+    """Returns {profileId: [(id, type, difficulty), ...]} and whether every profile was read just now."""
+    if refresh:
+        for profile_id in profile_ids:
+            profile_index.invalidate(profile_id)
+    entries, missing = profile_index.get_many(profile_ids)
+    if missing:
+        ids_placeholder = ','.join([f':id{i}' for i in range(len(missing))])
+        response = execute_statement(
+            sql=f"SELECT q.profileId, q.id, q.type, s.timesAnswered, s.timesCorrect FROM Questions q LEFT JOIN QuestionStats s ON s.questionId = q.id WHERE q.profileId IN ({ids_placeholder})",
+            parameters=[{'name': f'id{i}', 'value': {'longValue': p_id}} for i, p_id in enumerate(missing)]
+        )
+        loaded = {profile_id: [] for profile_id in missing}
+        for record in response['records']:
+            loaded[record[0]['longValue']].append((
+                record[1]['longValue'],
+                grader_name(record[2].get('stringValue')),
+                difficulty(record[3].get('longValue'), record[4].get('longValue'))
+            ))
+        for profile_id, profile_entries in loaded.items():
+            profile_index.set(profile_id, profile_entries)
+        entries.update(loaded)
+    return entries, len(missing) == len(profile_ids)
+
+
+def seen_question_ids(user_id):
+    # Through QuizQuestion rather than the results JSON: an indexed read per quiz the user took
+    try:
+        response = execute_statement(
+            sql="SELECT DISTINCT qq.questionId FROM QuizHistory h JOIN QuizQuestion qq ON qq.quizId = h.quizId WHERE h.userId = :userId",
+            parameters=[
+                {'name': 'userId', 'value': {'longValue': user_id}}
+            ]
+        )
+        return {record[0]['longValue'] for record in response['records']}
+    except Exception as e:
+        print(f"Error retrieving seen questions: {str(e)}")
+        raise
+
+
+def assemble_quiz(constraints, excluded_ids=frozenset(), refresh=False):
+    """Pick question ids for the constraints, or None when they cannot be met.
+
+    Returns the ids in quiz order and whether the index was read just now, so a
+    caller holding a stale answer can retry once with refresh=True.
+    """
+    entries, fresh = load_profile_index(constraints['profileIds'], refresh)
+    candidates = [
+        entry
+        for profile_id in constraints['profileIds']
+        for entry in entries[profile_id]
+        if entry[0] not in excluded_ids
+    ]
+    random.shuffle(candidates)
+    return solve(candidates, constraints['numberQuestions'], constraints['typeCounts'],
+                 constraints['difficultyCounts']), fresh
+
+
+def solve(candidates, number_questions, type_counts, difficulty_counts=None):
+    # Type counts are exact: listed types fill their count and the rest of the quiz comes from
+    # other types. The difficulty mix is best effort; each pick takes the level furthest below
+    # its count that the type still has, so a short level is made up from the others.
+    members = {}
+    for question_id, question_type, level in candidates:
+        group = question_type if question_type in type_counts else None
+        members.setdefault(group, []).append((question_id, level))
+
+    needs = {group: count for group, count in type_counts.items() if count}
+    needs[None] = number_questions - sum(type_counts.values())
+    if any(len(members.get(group, [])) < need for group, need in needs.items()):
+        return None
+
+    remaining = dict(difficulty_counts) if difficulty_counts else None
+    chosen = []
+    # Groups with the least slack pick first, before others use up the levels they need
+    for group in sorted(needs, key=lambda name: len(members.get(name, [])) - needs[name]):
+        group_members = members.get(group, [])
+        if remaining is None:
+            # Candidates are shuffled, so the first ones of the group are a uniform sample
+            chosen.extend(question_id for question_id, _ in group_members[:needs[group]])
+            continue
+        levels = {name: [] for name in DIFFICULTIES}
+        for question_id, level in group_members:
+            levels[level].append(question_id)
+        for _ in range(needs[group]):
+            available = [level for level in DIFFICULTIES if levels[level]]
+            deficit = max(remaining[level] for level in available)
+            level = random.choice([level for level in available if remaining[level] == deficit])
+            chosen.append(levels[level].pop())
+            remaining[level] -= 1
+
+    random.shuffle(chosen)
+    return chosen
@@ -0,0 +1,46 @@
+import json
+from dataAccess import batch_execute_statement, execute_statement
+
+
+def insert_quiz_questions(quiz_id, question_ids, transaction_id=None):
+    # INSERT IGNORE on the (quizId, position) key makes re-running a backfill harmless
+    try:
+        batch_execute_statement(
+            "INSERT IGNORE INTO QuizQuestion (quizId, position, questionId) VALUES (:quizId, :position, :questionId);",
+            [
+                [
+                    {'name': 'quizId', 'value': {'longValue': quiz_id}},
+                    {'name': 'position', 'value': {'longValue': position}},
+                    {'name': 'questionId', 'value': {'longValue': question_id}}
+                ]
+                for position, question_id in enumerate(question_ids)
+            ],
+            **({'transactionId': transaction_id} if transaction_id else {})
+        )
+    except Exception as e:
+        print(f"Error inserting quiz questions: {str(e)}")
+        raise
+
+
+def get_quiz_questions(quiz_id):
+    # One join in quiz order; an empty result means the quiz predates QuizQuestion and is not backfilled yet
+    try:
+        response = execute_statement(
+            sql="SELECT q.id, q.text, q.type, q.answer, q.updatedAt FROM QuizQuestion qq JOIN Questions q ON q.id = qq.questionId WHERE qq.quizId = :quizId ORDER BY qq.position",
+            parameters=[
+                {'name': 'quizId', 'value': {'longValue': quiz_id}}
+            ]
+        )
+        return [
+            {
+                'id': record[0]['longValue'],
+                'text': record[1]['stringValue'],
+                'type': record[2].get('stringValue'),
+                'answer': json.loads(record[3]['stringValue']),
+                'updatedAt': record[4].get('stringValue')
+            }
+            for record in response['records']
+        ]
+    except Exception as e:
+        print(f"Error retrieving quiz questions: {str(e)}")
+        raise
@@ -0,0 +1,160 @@
+import json
+from dataAccess import (batch_execute_statement, begin_transaction, commit_transaction, execute_statement, field_value,
+                        rollback_transaction)
+from questionStats import record_answers
+from quizSessions import claim_quizzes
+
+
+def build_pass_message(score_percentage):
+    return f'Congratulations! You have passed with a score of {score_percentage}%.'
+
+
+# Stored submissions are filtered out before this insert, inside the same transaction. A
+# concurrent delivery of the same result then fails on the unique submissionId and is retried,
+# instead of being absorbed in a way that would still count its answers a second time.
+INSERT_QUIZ_HISTORY_SQL = "INSERT INTO QuizHistory (userId, quizId, score, status, correctAnswers, totalQuestions, scorePercentage, notAnsweredOrFalse, results, submissionId) VALUES (:userId, :quizId, :score, :status, :correctAnswers, :totalQuestions, :scorePercentage, :notAnsweredOrFalse, :results, :submissionId)"
+
+
+# Recomputes one candidate's row for the quiz's job from their attempts (an indexed read on
+# QuizHistory userId, quizId). Rebuilding the row rather than incrementing it keeps the ranking
+# exact when a result is redelivered or a previous refresh failed.
+REFRESH_JOB_RANKING_SQL = "INSERT INTO JobRanking (jobId, userId, bestScore, attempts, lastAttemptAt) SELECT q.jobId, h.userId, MAX(h.scorePercentage), COUNT(*), MAX(h.date) FROM QuizHistory h JOIN Quiz q ON q.id = h.quizId WHERE h.userId = :userId AND q.jobId = (SELECT jobId FROM Quiz WHERE id = :quizId) GROUP BY q.jobId, h.userId ON DUPLICATE KEY UPDATE bestScore = VALUES(bestScore), attempts = VALUES(attempts), lastAttemptAt = VALUES(lastAttemptAt)"
+
+
+def quiz_history_parameters(user_id, quiz_id, score_percentage, status, correct_answers, total_questions,
+                            not_answered_or_false, results, submission_id=None):
+    return [
+        {'name': 'userId', 'value': {'longValue': user_id}},
+        {'name': 'quizId', 'value': {'longValue': quiz_id}},
+        {'name': 'score', 'value': {'doubleValue': score_percentage}},
+        {'name': 'status', 'value': {'stringValue': status}},
+        {'name': 'correctAnswers', 'value': {'longValue': correct_answers}},
+        {'name': 'totalQuestions', 'value': {'longValue': total_questions}},
+        {'name': 'scorePercentage', 'value': {'doubleValue': score_percentage}},
+        {'name': 'notAnsweredOrFalse', 'value': {'longValue': not_answered_or_false}},
+        {'name': 'results', 'value': {'stringValue': json.dumps(results)}},
+        {'name': 'submissionId', 'value': {'stringValue': submission_id} if submission_id else {'isNull': True}}
+    ]
+
+
+def insert_quiz_history(transaction_id, user_id, quiz_id, score_percentage, status, correct_answers,
+                        total_questions, not_answered_or_false, results, submission_id=None):
+    # True when the row is new; its question counters are recorded in the same transaction
+    if submission_id in stored_submission_ids([submission_id], transaction_id):
+        return False
+    execute_statement(
+        sql=INSERT_QUIZ_HISTORY_SQL,
+        parameters=quiz_history_parameters(user_id, quiz_id, score_percentage, status, correct_answers,
+                                           total_questions, not_answered_or_false, results, submission_id),
+        transactionId=transaction_id
+    )
+    record_answers([results], transaction_id)
+    return True
+
+
+def store_quiz_history(user_id, quiz_id, score_percentage, status, correct_answers, total_questions,
+                       not_answered_or_false, results, submission_id=None):
+    """Store one result; returns False when the submission was already stored."""
+    try:
+        transaction_id = begin_transaction()
+        try:
+            stored = insert_quiz_history(transaction_id, user_id, quiz_id, score_percentage, status, correct_answers,
+                                         total_questions, not_answered_or_false, results, submission_id)
+            commit_transaction(transaction_id)
+        except Exception:
+            rollback_transaction(transaction_id)
+            raise
+
+        if stored:
+            print("Quiz history stored successfully.")
+        else:
+            print(f"Quiz history for submission {submission_id} already stored.")
+        refresh_job_ranking([(user_id, quiz_id)])
+        return stored
+    except Exception as e:
+        print(f"Error storing quiz history: {str(e)}")
+        raise
+
+
+def store_quiz_histories(parameter_sets, claim_status=None):
+    # Many results in one call; each set comes from quiz_history_parameters. Returns the
+    # submission ids stored by this call, so callers only act on results that are new, and
+    # the ids left out because their quiz could not be claimed. With claim_status, each quiz
+    # is claimed (see claim_quizzes) in the same transaction and only its first new result is
+    # stored, so a session never gets a second result from another path.
+    try:
+        transaction_id = begin_transaction()
+        try:
+            # Submissions already stored, or repeated in the batch, are left out, so re-running a
+            # batch does not store results or count answers twice
+            stored_ids = stored_submission_ids(
+                [parameter_value(parameter_set, 'submissionId') for parameter_set in parameter_sets], transaction_id)
+            new_sets = []
+            for parameter_set in parameter_sets:
+                submission_id = parameter_value(parameter_set, 'submissionId')
+                if submission_id not in stored_ids:
+                    new_sets.append(parameter_set)
+                    if submission_id is not None:
+                        stored_ids.add(submission_id)
+            rejected_ids = set()
+            if claim_status:
+                claimed = claim_quizzes({parameter_value(parameter_set, 'quizId') for parameter_set in new_sets},
+                                        claim_status, transaction_id)
+                claimed_sets = []
+                for parameter_set in new_sets:
+                    quiz_id = parameter_value(parameter_set, 'quizId')
+                    if quiz_id in claimed:
+                        claimed_sets.append(parameter_set)
+                        claimed.remove(quiz_id)
+                    else:
+                        rejected_ids.add(parameter_value(parameter_set, 'submissionId'))
+                new_sets = claimed_sets
+            new_ids = {parameter_value(parameter_set, 'submissionId') for parameter_set in new_sets} - {None}
+            if new_sets:
+                batch_execute_statement(INSERT_QUIZ_HISTORY_SQL, new_sets, transactionId=transaction_id)
+                record_answers([json.loads(parameter_value(parameter_set, 'results')) for parameter_set in new_sets],
+                               transaction_id)
+            commit_transaction(transaction_id)
+        except Exception:
+            rollback_transaction(transaction_id)
+            raise
+
+        if new_sets:
+            refresh_job_ranking({
+                (parameter_value(parameter_set, 'userId'), parameter_value(parameter_set, 'quizId'))
+                for parameter_set in new_sets
+            })
+        return new_ids, rejected_ids
+    except Exception as e:
+        print(f"Error storing quiz history batch: {str(e)}")
+        raise
+
+
+def stored_submission_ids(submission_ids, transaction_id=None):
+    submission_ids = [submission_id for submission_id in submission_ids if submission_id is not None]
+    if not submission_ids:
+        return set()
+    response = execute_statement(
+        sql=f"SELECT submissionId FROM QuizHistory WHERE submissionId IN ({','.join(f':id{i}' for i in range(len(submission_ids)))})",
+        parameters=[{'name': f'id{i}', 'value': {'stringValue': s_id}} for i, s_id in enumerate(submission_ids)],
+        **({'transactionId': transaction_id} if transaction_id else {})
+    )
+    return {record[0]['stringValue'] for record in response['records']}
+
+
+def parameter_value(parameter_set, name):
+    return next(field_value(p['value']) for p in parameter_set if p['name'] == name)
+
+
+def refresh_job_ranking(user_quiz_pairs, transaction_id=None):
+    try:
+        batch_execute_statement(REFRESH_JOB_RANKING_SQL, [
+            [
+                {'name': 'userId', 'value': {'longValue': user_id}},
+                {'name': 'quizId', 'value': {'longValue': quiz_id}}
+            ]
+            for user_id, quiz_id in user_quiz_pairs
+        ], **({'transactionId': transaction_id} if transaction_id else {}))
+    except Exception as e:
+        print(f"Error refreshing job ranking: {str(e)}")
+        raise
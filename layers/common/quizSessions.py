@@ -0,0 +1,86 @@
+import datetime
+from dataAccess import execute_statement
+
+# A quiz is a timed session: it starts when it is created and must be submitted before expiresAt.
+# Timestamps are computed here in UTC, the Aurora session time zone, so every backend compares
+# them the same way. Submissions get a short grace period for network latency, and the sweeper
+# only closes sessions once that grace period has passed as well.
+SESSION_GRACE_SECONDS = 30
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def utc_now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def format_timestamp(moment):
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+
+def session_window(timer_minutes):
+    started_at = utc_now()
+    return format_timestamp(started_at), format_timestamp(started_at + datetime.timedelta(minutes=timer_minutes))
+
+
+def grace_cutoff():
+    # Sessions that expired before this moment can no longer be submitted
+    return format_timestamp(utc_now() - datetime.timedelta(seconds=SESSION_GRACE_SECONDS))
+
+
+def timestamp_parameter(name, value):
+    return {'name': name, 'value': {'stringValue': value}, 'typeHint': 'TIMESTAMP'}
+
+
+def is_expired(expires_at):
+    return expires_at is not None and expires_at < grace_cutoff()
+
+
+def claim_quiz(quiz_id, transaction_id=None):
+    # Moves an open, unexpired session to submitted; False means it was already submitted,
+    # closed by the sweeper or expired, so the caller must not store a result for it.
+    # Callers claim inside the transaction that stores the result, so both commit or neither does.
+    try:
+        response = execute_statement(
+            sql="UPDATE Quiz SET status = 'submitted' WHERE id = :quizId AND status = 'open' AND expiresAt >= :cutoff",
+            parameters=[
+                {'name': 'quizId', 'value': {'longValue': quiz_id}},
+                timestamp_parameter('cutoff', grace_cutoff())
+            ],
+            **({'transactionId': transaction_id} if transaction_id else {})
+        )
+        return response['numberOfRecordsUpdated'] > 0
+    except Exception as e:
+        print(f"Error claiming quiz session: {str(e)}")
+        raise
+
+
+def claim_quizzes(quiz_ids, status, transaction_id):
+    """Batch form of claim_quiz; returns the ids moved from open to status.
+
+    'submitted' takes sessions still inside their window (and older quizzes without one),
+    'expired' those past it. MySQL 5.7 has no UPDATE ... RETURNING, so the open rows are
+    locked and read first, then updated in the caller's transaction.
+    """
+    quiz_ids = list(quiz_ids)
+    if not quiz_ids:
+        return set()
+    window = "(expiresAt IS NULL OR expiresAt >= :cutoff)" if status == 'submitted' else "expiresAt < :cutoff"
+    try:
+        response = execute_statement(
+            sql=f"SELECT id FROM Quiz WHERE id IN ({','.join(f':id{i}' for i in range(len(quiz_ids)))}) AND status = 'open' AND {window} FOR UPDATE",
+            parameters=[{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(quiz_ids)] +
+                       [timestamp_parameter('cutoff', grace_cutoff())],
+            transactionId=transaction_id
+        )
+        claimed = [record[0]['longValue'] for record in response['records']]
+        if claimed:
+            execute_statement(
+                sql=f"UPDATE Quiz SET status = :status WHERE id IN ({','.join(f':id{i}' for i in range(len(claimed)))})",
+                parameters=[{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(claimed)] +
+                           [{'name': 'status', 'value': {'stringValue': status}}],
+                transactionId=transaction_id
+            )
+        return set(claimed)
+    except Exception as e:
+        print(f"Error claiming quiz sessions: {str(e)}")
+        raise
@@ -0,0 +1,52 @@
+import json
+from collections import namedtuple
+from dataAccess import execute_statement
+
+# Column names per SQL text. Only the first execution of a statement asks the Data API for
+# result metadata; later ones reuse the cached names and get smaller responses.
+_columns_by_sql = {}
+_row_types = {}
+
+
+def query_rows(sql, parameters=None, json_columns=(), as_rows=False, **kwargs):
+    """Run a SELECT and decode every record in one pass.
+
+    Returns a list of dicts keyed by column label (aliases included), or of
+    namedtuple rows when as_rows is True. Columns named in json_columns are
+    parsed from their JSON text.
+    """
+    columns = _columns_by_sql.get(sql)
+    if columns is None:
+        response = execute_statement(sql=sql, parameters=parameters, includeResultMetadata=True, **kwargs)
+        columns = tuple(column.get('label') or column['name'] for column in response['columnMetadata'])
+        _columns_by_sql[sql] = columns
+    else:
+        response = execute_statement(sql=sql, parameters=parameters, **kwargs)
+
+    return map_records(response['records'], columns, json_columns, as_rows)
+
+
+def map_records(records, columns, json_columns=(), as_rows=False):
+    json_positions = [position for position, column in enumerate(columns) if column in json_columns]
+    decoded = []
+    for record in records:
+        # Every Data API field holds exactly one key: the typed value, or isNull
+        values = [None if 'isNull' in field else next(iter(field.values())) for field in record]
+        for position in json_positions:
+            if values[position] is not None:
+                values[position] = json.loads(values[position])
+        decoded.append(values)
+
+    if as_rows:
+        row_type = row_type_for(columns)
+        return [row_type._make(values) for values in decoded]
+    return [dict(zip(columns, values)) for values in decoded]
+
+
+def row_type_for(columns):
+    # namedtuple instances carry no per-row __dict__, so large result sets stay compact
+    row_type = _row_types.get(columns)
+    if row_type is None:
+        row_type = namedtuple('Row', columns)
+        _row_types[columns] = row_type
+    return row_type
@@ -0,0 +1,153 @@
+import os
+import re
+import sqlite3
+import threading
+import uuid
+
+from dataApiValues import to_field, to_python
+
+# In-process stand-in for the rds-data client, selected with DB_BACKEND=sqlite. It is meant for
+# running handlers and benchmarks on a laptop: the schema is loaded from techQuiz.sql, the MySQL
+# statements the handlers issue are rewritten to SQLite, and responses use the Data API shapes.
+# No AWS account, cluster ARN or secret is needed.
+
+DEFAULT_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'techQuiz.sql')
+
+_UPSERT_PATTERN = re.compile(r'\bON\s+CONFLICT\s+DO\s+UPDATE\s+SET\b', re.I)
+# MySQL's VALUES(column) inside an upsert is SQLite's excluded.column
+_UPSERT_REWRITES = [(re.compile(r'\bVALUES\s*\(\s*([A-Za-z_]\w*)\s*\)', re.I), r'excluded.\1')]
+
+# UPDATE ... LIMIT n needs a SQLite build option; the same rows are picked through rowid instead
+_UPDATE_LIMIT_PATTERN = re.compile(r'^\s*UPDATE\s+(\w+)\s+SET\s+(.*?)\s+WHERE\s+(.*)\s+LIMIT\s+(:?\w+)\s*;?\s*$', re.I | re.S)
+
+_LITERAL_PATTERN = re.compile(r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")")
+
+# Statement rewrites, applied outside quoted literals
+_STATEMENT_REWRITES = [
+    (re.compile(r'^\s*SHOW\s+TABLES\s*;?\s*$', re.I),
+     "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.I), 'INSERT OR IGNORE'),
+    (re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.I), 'ON CONFLICT DO UPDATE SET'),
+    (re.compile(r'\bNOW\s*\(\s*\)', re.I), 'CURRENT_TIMESTAMP'),
+    (re.compile(r'\bRAND\s*\(\s*\)', re.I), 'RANDOM()'),
+    # A transaction already holds the shared connection, so row locks have nothing to add
+    (re.compile(r'\s+FOR\s+UPDATE\s*(;?\s*)$', re.I), r'\1')
+]
+
+# Schema rewrites for the CREATE TABLE statements of techQuiz.sql
+_SCHEMA_REWRITES = [
+    (re.compile(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', re.I), 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    (re.compile(r'\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP\b', re.I), ''),
+    (re.compile(r'\bUNIQUE\s+KEY\s+\w+\s*\(', re.I), 'UNIQUE (')
+]
+_INLINE_INDEX_PATTERN = re.compile(r',\s*(?:INDEX|KEY)\s+(\w+)\s*\(([^)]*)\)', re.I)
+_CREATE_TABLE_PATTERN = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.I)
+
+
+def _outside_literals(sql, rewrites):
+    parts = _LITERAL_PATTERN.split(sql)
+    for position in range(0, len(parts), 2):
+        for pattern, replacement in rewrites:
+            parts[position] = pattern.sub(replacement, parts[position])
+    return ''.join(parts)
+
+
+def translate_sql(sql):
+    translated = _outside_literals(sql, _STATEMENT_REWRITES)
+    upsert = _UPSERT_PATTERN.search(translated)
+    if upsert:
+        translated = translated[:upsert.end()] + _outside_literals(translated[upsert.end():], _UPSERT_REWRITES)
+    return _UPDATE_LIMIT_PATTERN.sub(r'UPDATE \1 SET \2 WHERE rowid IN (SELECT rowid FROM \1 WHERE \3 LIMIT \4)', translated)
+
+
+def translate_schema(script):
+    statements = []
+    for statement in script.split(';'):
+        # Drop comment lines so they do not hide the statement that follows them
+        statement = '\n'.join(line for line in statement.splitlines() if not line.strip().startswith('--')).strip()
+        if not statement:
+            continue
+        statement = _outside_literals(statement, _SCHEMA_REWRITES)
+        table = _CREATE_TABLE_PATTERN.match(statement)
+        indexes = []
+        if table:
+            # SQLite has no inline secondary indexes; they become CREATE INDEX statements
+            for name, columns in _INLINE_INDEX_PATTERN.findall(statement):
+                indexes.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table.group(1)} ({columns})")
+            statement = _INLINE_INDEX_PATTERN.sub('', statement)
+        statements.append(statement)
+        statements.extend(indexes)
+    return statements
+
+
+class SqliteClient:
+    def __init__(self):
+        self.path = os.environ.get('DB_PATH', ':memory:')
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        # A single connection is shared, so statements are serialized. A transaction holds the
+        # lock from begin to commit; the owning thread re-enters it for its own statements.
+        self._lock = threading.RLock()
+        self._transactions = set()
+        if not self._table_names():
+            self.load_schema(os.environ.get('DB_SCHEMA_PATH', DEFAULT_SCHEMA_PATH))
+
+    def _table_names(self):
+        rows = self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        return {row[0] for row in rows}
+
+    def load_schema(self, schema_path):
+        with open(schema_path) as schema_file:
+            statements = translate_schema(schema_file.read())
+        with self._lock:
+            for statement in statements:
+                self.connection.execute(statement)
+
+    def _run(self, sql, parameters, include_metadata):
+        cursor = self.connection.execute(translate_sql(sql), {p['name']: to_python(p['value']) for p in parameters})
+        if cursor.description:
+            response = {
+                'numberOfRecordsUpdated': 0,
+                'records': [[to_field(value) for value in row] for row in cursor.fetchall()]
+            }
+            if include_metadata:
+                response['columnMetadata'] = [{'name': column[0], 'label': column[0]} for column in cursor.description]
+            return response
+        generated = [{'longValue': cursor.lastrowid}] if cursor.lastrowid and sql.lstrip()[:6].upper() == 'INSERT' else []
+        return {'numberOfRecordsUpdated': max(cursor.rowcount, 0), 'records': [], 'generatedFields': generated}
+
+    def execute_statement(self, resourceArn=None, secretArn=None, sql=None, database=None, parameters=None,
+                          transactionId=None, includeResultMetadata=False, **kwargs):
+        with self._lock:
+            return self._run(sql, parameters or [], includeResultMetadata)
+
+    def batch_execute_statement(self, resourceArn=None, secretArn=None, sql=None, database=None,
+                                parameterSets=None, transactionId=None, **kwargs):
+        parameter_sets = parameterSets or []
+        rows = [{p['name']: to_python(p['value']) for p in parameter_set} for parameter_set in parameter_sets]
+        with self._lock:
+            self.connection.executemany(translate_sql(sql), rows)
+        return {'updateResults': [{'generatedFields': []} for _ in rows]}
+
+    def begin_transaction(self, resourceArn=None, secretArn=None, database=None, **kwargs):
+        self._lock.acquire()
+        self.connection.execute('BEGIN')
+        transaction_id = str(uuid.uuid4())
+        self._transactions.add(transaction_id)
+        return {'transactionId': transaction_id}
+
+    def commit_transaction(self, resourceArn=None, secretArn=None, transactionId=None):
+        self._transactions.remove(transactionId)
+        try:
+            self.connection.execute('COMMIT')
+        finally:
+            self._lock.release()
+        return {'transactionStatus': 'Transaction Committed'}
+
+    def rollback_transaction(self, resourceArn=None, secretArn=None, transactionId=None):
+        self._transactions.remove(transactionId)
+        try:
+            self.connection.execute('ROLLBACK')
+        finally:
+            self._lock.release()
+        return {'transactionStatus': 'Rollback Complete'}
@@ -0,0 +1,193 @@
+"""Cold start benchmark for every function in template.yaml.
+
+Local mode (default) starts a fresh interpreter per function, imports its
+handler with the CommonLayer on the path and sends it one probe event,
+reporting import time and time to first response. AWS calls are pointed at a
+closed local port so they fail fast instead of reaching a real account.
+
+Deployed mode (--deployed) measures the real thing: it forces a new execution
+environment for each function of the stack by touching an environment
+variable, invokes it once with the probe event and reports the Init Duration
+and Duration from the Lambda REPORT line. Handlers that write (the migration
+runner, the backfill) are idempotent, so a probe invocation is harmless.
+
+    python scripts/coldStartBenchmark.py [--deployed] [--stack teamquiz] [--repeat 3] [Function ...]
+"""
+import argparse
+import base64
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(ROOT, 'template.yaml')
+LAYER_PATH = os.path.join(ROOT, 'layers', 'common')
+
+# API Gateway shaped, with nothing filled in, so every handler answers without side effects
+PROBE_EVENT = {
+    'httpMethod': 'GET',
+    'headers': {},
+    'pathParameters': {},
+    'queryStringParameters': {},
+    'body': None,
+    'requestContext': {'authorizer': {'claims': {}}},
+    'Records': []
+}
+
+LOCAL_ENVIRONMENT = {
+    'CLUSTER_ARN': 'arn:aws:rds:us-east-1:000000000000:cluster:benchmark',
+    'SECRET_ARN': 'arn:aws:secretsmanager:us-east-1:000000000000:secret:benchmark',
+    'DB_NAME': 'benchmark',
+    'SNS_TOPIC_ARN': 'arn:aws:sns:us-east-1:000000000000:benchmark',
+    'RESUME_BUCKET': 'benchmark',
+    'IMPORT_BUCKET': 'benchmark',
+    'CLOUDFRONT_DOMAIN': 'benchmark.cloudfront.net',
+    'CLIENT_ID': 'benchmark',
+    'SENDER_EMAIL': 'benchmark@example.com',
+    'EMAIL_BACKEND': 'stub',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark',
+    'AWS_ENDPOINT_URL': 'http://127.0.0.1:9',
+    'AWS_MAX_ATTEMPTS': '1'
+}
+
+LOCAL_RUNNER = """
+import importlib, json, sys, time
+started = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+try:
+    response = getattr(module, sys.argv[2])(json.loads(sys.argv[3]), None)
+    status = response.get('statusCode', 'ok') if isinstance(response, dict) else 'ok'
+except Exception as e:
+    status = type(e).__name__
+finished = time.perf_counter()
+print(json.dumps({'importMs': (imported - started) * 1000, 'firstResponseMs': (finished - started) * 1000, 'status': status}))
+"""
+
+REPORT_PATTERN = re.compile(r'Duration: ([\d.]+) ms.*?Init Duration: ([\d.]+) ms', re.S)
+
+
+class TemplateLoader(yaml.SafeLoader):
+    pass
+
+
+# CloudFormation short-form tags (!Ref, !GetAtt, !Sub...) are kept as plain values
+TemplateLoader.add_multi_constructor('!', lambda loader, suffix, node: None)
+
+
+def load_functions(names=None):
+    with open(TEMPLATE_PATH) as template_file:
+        template = yaml.load(template_file, Loader=TemplateLoader)
+
+    functions = []
+    for logical_id, resource in template['Resources'].items():
+        if resource.get('Type') != 'AWS::Serverless::Function':
+            continue
+        if names and logical_id not in names:
+            continue
+        properties = resource['Properties']
+        module, handler = properties['Handler'].rsplit('.', 1)
+        routes = [
+            (event['Properties']['Method'].upper(), event['Properties']['Path'])
+            for event in (properties.get('Events') or {}).values() if event.get('Type') == 'Api'
+        ]
+        functions.append({
+            'name': logical_id,
+            'codeUri': os.path.join(ROOT, properties['CodeUri']),
+            'module': module,
+            'handler': handler,
+            'routes': routes
+        })
+    return functions
+
+
+def run_local(function):
+    environment = dict(os.environ, **LOCAL_ENVIRONMENT)
+    environment['PYTHONPATH'] = os.pathsep.join([function['codeUri'], LAYER_PATH])
+    result = subprocess.run(
+        [sys.executable, '-c', LOCAL_RUNNER, function['module'], function['handler'], json.dumps(PROBE_EVENT)],
+        cwd=function['codeUri'], env=environment, capture_output=True, text=True
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'no output')
+    measurement = json.loads(lines[-1])
+    return {'initMs': measurement['importMs'], 'totalMs': measurement['firstResponseMs'], 'status': measurement['status']}
+
+
+def get_physical_names(stack_name):
+    import boto3
+    cloudformation = boto3.client('cloudformation')
+    names = {}
+    for page in cloudformation.get_paginator('list_stack_resources').paginate(StackName=stack_name):
+        for resource in page['StackResourceSummaries']:
+            if resource['ResourceType'] == 'AWS::Lambda::Function':
+                names[resource['LogicalResourceId']] = resource['PhysicalResourceId']
+    return names
+
+
+def run_deployed(function, physical_name, lambda_client):
+    # A configuration change retires the warm environments, so the next invoke is a cold start.
+    # The original variables are put back afterwards, even when the probe fails.
+    configuration = lambda_client.get_function_configuration(FunctionName=physical_name)
+    original_variables = configuration.get('Environment', {}).get('Variables', {})
+    variables = dict(original_variables, BENCHMARK_NONCE=str(time.time_ns()))
+    lambda_client.update_function_configuration(FunctionName=physical_name, Environment={'Variables': variables})
+    try:
+        lambda_client.get_waiter('function_updated').wait(FunctionName=physical_name)
+        response = lambda_client.invoke(FunctionName=physical_name, Payload=json.dumps(PROBE_EVENT), LogType='Tail')
+    finally:
+        lambda_client.update_function_configuration(FunctionName=physical_name,
+                                                    Environment={'Variables': original_variables})
+        lambda_client.get_waiter('function_updated').wait(FunctionName=physical_name)
+
+    log = base64.b64decode(response['LogResult']).decode('utf-8', 'replace')
+    match = REPORT_PATTERN.search(log)
+    if not match:
+        raise RuntimeError('no Init Duration in REPORT line, the invocation was not a cold start')
+    duration, init_duration = float(match.group(1)), float(match.group(2))
+    status = 'error' if response.get('FunctionError') else 'ok'
+    return {'initMs': init_duration, 'totalMs': init_duration + duration, 'status': status}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import-to-first-response for each function in template.yaml.')
+    parser.add_argument('functions', nargs='*', help='logical ids to measure (default: all)')
+    parser.add_argument('--deployed', action='store_true', help='measure the deployed stack instead of local imports')
+    parser.add_argument('--stack', default='teamquiz', help='CloudFormation stack name for --deployed')
+    parser.add_argument('--repeat', type=int, default=3, help='cold starts per function')
+    args = parser.parse_args()
+
+    functions = load_functions(set(args.functions))
+    if args.deployed:
+        import boto3
+        lambda_client = boto3.client('lambda')
+        physical_names = get_physical_names(args.stack)
+
+    print(f"{'Function':<40}{'init ms':>10}{'total ms':>10}  status")
+    for function in functions:
+        samples = []
+        try:
+            for _ in range(args.repeat):
+                if args.deployed:
+                    samples.append(run_deployed(function, physical_names[function['name']], lambda_client))
+                else:
+                    samples.append(run_local(function))
+        except Exception as e:
+            print(f"{function['name']:<40}{'-':>10}{'-':>10}  failed: {str(e)}")
+            continue
+        init_ms = statistics.median(sample['initMs'] for sample in samples)
+        total_ms = statistics.median(sample['totalMs'] for sample in samples)
+        print(f"{function['name']:<40}{init_ms:>10.1f}{total_ms:>10.1f}  {samples[-1]['status']}")
+
+
+if __name__ == '__main__':
+    main()
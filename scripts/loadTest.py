@@ -0,0 +1,380 @@
+"""Load test driven by the Postman collection.
+
+Every request in postman/teamQuiz.postman_collection.json becomes a weighted
+scenario. Scenarios are started at a fixed rate (open loop), so a slow endpoint
+shows up as latency instead of quietly lowering the request rate. The report
+gives latency percentiles and a histogram per endpoint, slowest first.
+
+Two targets are supported:
+
+    # API running under `sam local start-api` (or a deployed stage)
+    python scripts/loadTest.py --target http://127.0.0.1:3000 --token <id token> --rps 20 --duration 60
+
+    # Handlers invoked in this process against the SQLite backend, with
+    # in-memory SNS and S3 stand-ins. No AWS account or Docker needed.
+    python scripts/loadTest.py --in-process --rps 50 --duration 30
+
+Weights default to a read-heavy mix and can be overridden per endpoint, for
+example --weight "POST /validatequiz=20" --weight "DELETE /company/{companyId}=0".
+"""
+import argparse
+import bisect
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from coldStartBenchmark import LAYER_PATH, ROOT, load_functions
+
+COLLECTION_PATH = os.path.join(ROOT, 'postman', 'teamQuiz.postman_collection.json')
+
+DEFAULT_METHOD_WEIGHTS = {'GET': 8, 'POST': 2, 'PUT': 1, 'DELETE': 1}
+# The quiz flow is what peaks during hiring events
+DEFAULT_ENDPOINT_WEIGHTS = {'POST /quiz': 6, 'POST /validatequiz': 6}
+# Cognito cannot run in-process, so the token endpoint is only exercised over HTTP
+IN_PROCESS_SKIPPED = {'POST /token'}
+
+# Upper bounds in milliseconds
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')]
+
+SEED_QUESTIONS_PER_PROFILE = 40
+SEED_PROFILES = 5
+
+# Quiz created before each validatequiz request; matches the in-process seed data
+DEFAULT_QUIZ_BODY = {'profileId': 1, 'numberQuestions': 5, 'timer': 30, 'userId': 1, 'jobId': 1}
+
+
+def load_scenarios():
+    with open(COLLECTION_PATH) as collection_file:
+        collection = json.load(collection_file)
+
+    scenarios = []
+
+    def walk(items):
+        for item in items:
+            if 'item' in item:
+                walk(item['item'])
+                continue
+            request = item['request']
+            # Drop the stage segment (Prod) so paths match the template routes
+            segments = [segment for segment in request['url']['path'] if segment]
+            if segments and segments[0] == 'Prod':
+                segments = segments[1:]
+            body = (request.get('body') or {}).get('raw')
+            scenarios.append({
+                'name': item['name'],
+                'method': request['method'],
+                'path': '/' + '/'.join(segments),
+                'body': body if body else None
+            })
+
+    walk(collection['item'])
+    return scenarios
+
+
+def build_routes():
+    routes = []
+    for function in load_functions():
+        for method, path in function['routes']:
+            names = re.findall(r'{(\w+)}', path)
+            pattern = re.compile('^' + re.sub(r'{\w+}', r'([^/]+)', path) + '$')
+            routes.append({'method': method, 'path': path, 'pattern': pattern, 'names': names, 'function': function})
+    return routes
+
+
+def match_route(routes, method, path):
+    for route in routes:
+        match = route['pattern'].match(path)
+        if route['method'] == method and match:
+            return route, dict(zip(route['names'], match.groups()))
+    return None, {}
+
+
+def assign_weights(scenarios, routes, overrides, in_process):
+    for scenario in scenarios:
+        route, _ = match_route(routes, scenario['method'], scenario['path'])
+        scenario['endpoint'] = f"{scenario['method']} {route['path'] if route else scenario['path']}"
+        weight = DEFAULT_ENDPOINT_WEIGHTS.get(scenario['endpoint'], DEFAULT_METHOD_WEIGHTS.get(scenario['method'], 1))
+        if in_process and scenario['endpoint'] in IN_PROCESS_SKIPPED:
+            weight = 0
+        scenario['weight'] = overrides.get(scenario['endpoint'], weight)
+    return [scenario for scenario in scenarios if scenario['weight'] > 0]
+
+
+class HttpTarget:
+    def __init__(self, base_url, token):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {'Content-Type': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f"Bearer {token}"
+
+    def request(self, method, path, body):
+        data = body.encode('utf-8') if body else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers=self.headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return response.status, response.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8')
+
+    def send(self, scenario):
+        return self.request(scenario['method'], scenario['path'], scenario['body'])[0]
+
+
+class LocalSnsClient:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, **kwargs):
+        self.published.append(kwargs)
+        return {'MessageId': str(len(self.published))}
+
+
+class LocalS3Client:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+        return {}
+
+    def generate_presigned_post(self, Bucket, Key, **kwargs):
+        return {'url': f"http://localhost/{Bucket}", 'fields': {'key': Key}}
+
+
+class InProcessTarget:
+    def __init__(self, routes, scenarios):
+        os.environ.update({
+            'DB_BACKEND': 'sqlite',
+            'EMAIL_BACKEND': 'stub',
+            'SNS_TOPIC_ARN': 'arn:aws:sns:local:000000000000:teamquiz',
+            'RESUME_BUCKET': 'teamquiz-local',
+            'IMPORT_BUCKET': 'teamquiz-local-imports',
+            'CLOUDFRONT_DOMAIN': 'localhost'
+        })
+        sys.path.insert(0, LAYER_PATH)
+        from awsClients import register_client
+        register_client('sns', LocalSnsClient())
+        register_client('s3', LocalS3Client())
+
+        self.routes = routes
+        self.handlers = {}
+        # Only the handlers the mix reaches are imported, plus CreateQuiz for the quiz behind each submission
+        for method, path in [(scenario['method'], scenario['path']) for scenario in scenarios] + [('POST', '/quiz')]:
+            route, _ = match_route(routes, method, path)
+            if route and route['function']['name'] not in self.handlers:
+                self.handlers[route['function']['name']] = self.load_handler(route['function'])
+
+    def load_handler(self, function):
+        # Handler modules share names across folders (create.py, read.py...), so each one is loaded
+        # under its function's name, with its folder on the path for sibling imports
+        path = os.path.join(function['codeUri'], function['module'] + '.py')
+        spec = importlib.util.spec_from_file_location(function['name'], path)
+        module = importlib.util.module_from_spec(spec)
+        sys.path.insert(0, function['codeUri'])
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(function['codeUri'])
+        return getattr(module, function['handler'])
+
+    def seed(self):
+        from dataAccess import execute_statement
+        execute_statement(
+            sql="INSERT INTO User (firstName, lastName, userName, email, role) VALUES ('Load', 'Test', 'loadtest', 'loadtest@example.com', 'candidate')")
+        for profile in range(1, SEED_PROFILES + 1):
+            execute_statement(sql="INSERT INTO Profile (title) VALUES (:title)",
+                              parameters=[{'name': 'title', 'value': {'stringValue': f"Profile {profile}"}}])
+            execute_statement(sql="INSERT INTO Company (name, location, description) VALUES (:name, 'Remote', 'Seeded')",
+                              parameters=[{'name': 'name', 'value': {'stringValue': f"Company {profile}"}}])
+            execute_statement(sql="INSERT INTO Job (title, description, requirements, companyId) VALUES (:title, 'Seeded', 'None', :companyId)",
+                              parameters=[{'name': 'title', 'value': {'stringValue': f"Job {profile}"}},
+                                          {'name': 'companyId', 'value': {'longValue': profile}}])
+            for number in range(SEED_QUESTIONS_PER_PROFILE):
+                options = [f"Option {number}-{choice}" for choice in range(4)]
+                execute_statement(
+                    sql="INSERT INTO Questions (profileId, text, type, options, answer) VALUES (:profileId, :text, 'single-choice', :options, :answer)",
+                    parameters=[{'name': 'profileId', 'value': {'longValue': profile}},
+                                {'name': 'text', 'value': {'stringValue': f"Question {number} of profile {profile}"}},
+                                {'name': 'options', 'value': {'stringValue': json.dumps(options)}},
+                                {'name': 'answer', 'value': {'stringValue': json.dumps(options[0])}}])
+
+    def request(self, method, path, body):
+        route, path_parameters = match_route(self.routes, method, path)
+        if route is None:
+            return 404, ''
+        event = {
+            'httpMethod': method,
+            'path': path,
+            'pathParameters': path_parameters,
+            'queryStringParameters': None,
+            'headers': {'Content-Type': 'application/json'},
+            'body': body
+        }
+        response = self.handlers[route['function']['name']](event, None)
+        return response.get('statusCode', 200), response.get('body', '')
+
+    def send(self, scenario):
+        return self.request(scenario['method'], scenario['path'], scenario['body'])[0]
+
+
+def fresh_submission(target, scenario, quiz_body):
+    # A quiz accepts a single submission, so replaying the collection's fixed quizId would only
+    # measure the 409 path. Each validatequiz request gets a quiz of its own; creating it is not timed.
+    status, body = target.request('POST', '/quiz', json.dumps(quiz_body))
+    if status != 200:
+        return scenario
+    details = json.loads(body)['quizDetails']
+    submission = json.loads(scenario['body'] or '{}')
+    submission.update({
+        'quizId': details['quizId'],
+        'userId': details['userId'],
+        # Inline payloads carry options; with CDN payloads any answer exercises the same grading path
+        'responses': [{'questionId': q['id'], 'answer': (q.get('options') or [None])[0]} for q in details['questions']]
+    })
+    return dict(scenario, body=json.dumps(submission))
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, elapsed_ms, status):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append((elapsed_ms, status))
+
+    def report(self, elapsed_seconds):
+        total = sum(len(samples) for samples in self.samples.values())
+        print(f"\n{total} requests in {elapsed_seconds:.1f}s ({total / elapsed_seconds:.1f} req/s)\n")
+        print(f"{'Endpoint':<36}{'count':>7}{'5xx':>6}{'4xx':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+
+        summaries = []
+        for endpoint, samples in self.samples.items():
+            latencies = sorted(elapsed for elapsed, _ in samples)
+            summaries.append((percentile(latencies, 99), endpoint, samples, latencies))
+
+        for p99, endpoint, samples, latencies in sorted(summaries, reverse=True):
+            server_errors = sum(1 for _, status in samples if status >= 500)
+            client_errors = sum(1 for _, status in samples if 400 <= status < 500)
+            print(f"{endpoint:<36}{len(samples):>7}{server_errors:>6}{client_errors:>6}"
+                  f"{percentile(latencies, 50):>9.1f}{percentile(latencies, 90):>9.1f}{p99:>9.1f}{latencies[-1]:>9.1f}")
+
+        for _, endpoint, _, latencies in sorted(summaries, reverse=True):
+            print(f"\n{endpoint} (ms)")
+            print_histogram(latencies)
+
+
+def percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, max(0, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def print_histogram(latencies):
+    counts = [0] * len(HISTOGRAM_BUCKETS)
+    for latency in latencies:
+        counts[bisect.bisect_left(HISTOGRAM_BUCKETS, latency)] += 1
+    widest = max(counts)
+    lower = 0
+    for upper, count in zip(HISTOGRAM_BUCKETS, counts):
+        if count:
+            label = f"{lower:g}-{upper:g}" if upper != float('inf') else f">{lower:g}"
+            print(f"  {label:>12} {'#' * max(1, round(40 * count / widest)):<40} {count}")
+        lower = upper
+
+
+def run(target, scenarios, rps, duration, concurrency, quiz_body):
+    recorder = LatencyRecorder()
+    weights = [scenario['weight'] for scenario in scenarios]
+
+    def execute(scenario):
+        if scenario['endpoint'] == 'POST /validatequiz':
+            try:
+                scenario = fresh_submission(target, scenario, quiz_body)
+            except Exception:
+                pass
+        started = time.perf_counter()
+        try:
+            status = target.send(scenario)
+        except Exception:
+            status = 599
+        recorder.record(scenario['endpoint'], (time.perf_counter() - started) * 1000, status)
+
+    interval = 1.0 / rps
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        sent = 0
+        while True:
+            # Open loop: each request has a scheduled start, independent of earlier responses
+            scheduled = started + sent * interval
+            if scheduled - started >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(execute, random.choices(scenarios, weights)[0])
+            sent += 1
+    return recorder, time.perf_counter() - started
+
+
+def parse_weights(values):
+    overrides = {}
+    for value in values:
+        endpoint, _, weight = value.rpartition('=')
+        if not endpoint:
+            raise SystemExit(f"Invalid --weight {value!r}, expected 'METHOD /path=weight'.")
+        overrides[endpoint.strip()] = float(weight)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay the Postman collection as a weighted load test.')
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument('--target', help='base URL, for example http://127.0.0.1:3000 for sam local start-api')
+    target_group.add_argument('--in-process', action='store_true', help='invoke the handlers in this process against SQLite')
+    parser.add_argument('--token', help='Cognito id token sent as a bearer token (HTTP target only)')
+    parser.add_argument('--rps', type=float, default=10, help='requests started per second')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to run')
+    parser.add_argument('--concurrency', type=int, default=32, help='maximum requests in flight')
+    parser.add_argument('--weight', action='append', default=[], help="override a weight: 'METHOD /path=weight'")
+    parser.add_argument('--seed', type=int, help='random seed for a repeatable request mix')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    routes = build_routes()
+    scenarios = assign_weights(load_scenarios(), routes, parse_weights(args.weight), args.in_process)
+
+    print(f"{'Scenario':<36}{'endpoint':<36}weight")
+    for scenario in scenarios:
+        print(f"{scenario['name']:<36}{scenario['endpoint']:<36}{scenario['weight']:g}")
+
+    if args.in_process:
+        # Handlers log every request; keep that out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            target = InProcessTarget(routes, scenarios)
+            target.seed()
+            recorder, elapsed = run(target, scenarios, args.rps, args.duration, args.concurrency, DEFAULT_QUIZ_BODY)
+    else:
+        # Over HTTP the collection's own CreateQuiz body names ids that exist in that database
+        quiz_scenario = next((scenario for scenario in load_scenarios()
+                              if scenario['method'] == 'POST' and scenario['path'] == '/quiz' and scenario['body']), None)
+        quiz_body = json.loads(quiz_scenario['body']) if quiz_scenario else DEFAULT_QUIZ_BODY
+        target = HttpTarget(args.target, args.token)
+        recorder, elapsed = run(target, scenarios, args.rps, args.duration, args.concurrency, quiz_body)
+
+    recorder.report(elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import re
+from urllib.parse import unquote_plus
+from upsert import cloudfront_domain, save_application
+
+RESUME_KEY_PATTERN = re.compile(r'^resumeteamquiz_(\d+)_(\d+)\.pdf$')
+
+
+def lambda_handler(event, context):
+    # Raising makes Lambda retry the event, so a failed row write is not lost
+    for key in get_uploaded_keys(event):
+        match = RESUME_KEY_PATTERN.match(key)
+        if not match:
+            print(f"Ignoring object {key}: not a resume upload.")
+            continue
+
+        user_id = int(match.group(1))
+        job_id = int(match.group(2))
+        resume_url = f"https://{cloudfront_domain}/{key}"
+
+        save_application(user_id, job_id, resume_url)
+        print(f"Application recorded for user {user_id} and job {job_id}.")
+
+
+def get_uploaded_keys(event):
+    # EventBridge "Object Created" events, or classic S3 notifications
+    if 'detail' in event:
+        return [event['detail']['object']['key']]
+    return [unquote_plus(record['s3']['object']['key']) for record in event.get('Records', [])]
@@ -0,0 +1,72 @@
+import json
+from awsClients import get_client
+from upsert import s3_bucket_name, cloudfront_domain
+
+# Resumes are uploaded straight to S3; the finalize function records them once the object lands
+UPLOAD_EXPIRES_SECONDS = 900
+MAX_RESUME_BYTES = 20 * 1024 * 1024
+
+
+def lambda_handler(event, context):
+    try:
+        body = json.loads(event.get('body') or '{}')
+        user_id = body.get('userId')
+        job_id = body.get('jobId')
+
+        if user_id is None:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('userId is required.')
+            }
+        if job_id is None:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('jobId is required.')
+            }
+
+        try:
+            user_id = int(user_id)
+            job_id = int(job_id)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('userId and jobId must be integers.')
+            }
+
+        upload = create_resume_upload(user_id, job_id)
+        return {
+            'statusCode': 200,
+            'body': json.dumps(upload)
+        }
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
+
+
+def create_resume_upload(user_id, job_id):
+    try:
+        resume_file_name = f"resumeteamquiz_{user_id}_{job_id}.pdf"
+
+        presigned_post = get_client('s3').generate_presigned_post(
+            Bucket=s3_bucket_name,
+            Key=resume_file_name,
+            Fields={'Content-Type': 'application/pdf'},
+            Conditions=[
+                {'Content-Type': 'application/pdf'},
+                ['content-length-range', 1, MAX_RESUME_BYTES]
+            ],
+            ExpiresIn=UPLOAD_EXPIRES_SECONDS
+        )
+
+        return {
+            'uploadUrl': presigned_post['url'],
+            'fields': presigned_post['fields'],
+            'expiresIn': UPLOAD_EXPIRES_SECONDS,
+            'resumeUrl': f"https://{cloudfront_domain}/{resume_file_name}"
+        }
+    except Exception as e:
+        print(f"Error creating resume upload: {str(e)}")
+        raise
@@ -1,14 +1,10 @@
 import json
-import boto3
 import os
 import base64
+from awsClients import get_client
+from dataAccess import begin_transaction, commit_transaction, execute_statement, rollback_transaction
 
-rds_data_client = boto3.client('rds-data')
-s3_client = boto3.client('s3')
 
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
 s3_bucket_name = os.environ['RESUME_BUCKET']
 cloudfront_domain = os.environ['CLOUDFRONT_DOMAIN']
 
@@ -53,14 +49,7 @@ def lambda_handler(event, context):
                 'body': json.dumps('Failed to upload resume.')
             }
 
-        resume_id = find_or_update_resume(user_id, job_id, resume_url)
-        if not resume_id:
-            return {
-                'statusCode': 500,
-                'body': json.dumps('Failed to find or update resume record.')
-            }
-
-        create_application(user_id, job_id, resume_id)
+        save_application(user_id, job_id, resume_url)
         return {
             'statusCode': 200,
             'body': json.dumps('Application created successfully!')
@@ -79,7 +68,7 @@ def upload_resume_to_s3(resume_file, user_id, job_id):
 
         resume_file_name = f"resumeteamquiz_{user_id}_{job_id}.pdf"
 
-        s3_client.put_object(
+        get_client('s3').put_object(
             Bucket=s3_bucket_name,
             Key=resume_file_name,
             Body=resume_file_content,
@@ -93,124 +82,54 @@ def upload_resume_to_s3(resume_file, user_id, job_id):
         return None
 
 
-def find_or_update_resume(user_id, job_id, resume_url):
+def save_application(user_id, job_id, resume_url):
+    # One transaction: the resume upsert and the application insert succeed or fail together
+    transaction_id = begin_transaction()
     try:
-        user_exists = check_user_exists(user_id)
-
-        if user_exists:
-            response = rds_data_client.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql="SELECT resumeId, jobId FROM Resume WHERE userId = :userId;",
-                parameters=[
-                    {'name': 'userId', 'value': {'longValue': user_id}}
-                ]
-            )
-
-            existing_resumes = response['records']
-
-            for record in existing_resumes:
-                existing_job_id = record[1]['longValue']
-                if existing_job_id == job_id:
-                    resume_id = record[0]['longValue']
-                    rds_data_client.execute_statement(
-                        resourceArn=cluster_arn,
-                        secretArn=secret_arn,
-                        database=database_name,
-                        sql="UPDATE Resume SET resumeUrl = :resumeUrl, updatedAt = CURRENT_TIMESTAMP WHERE resumeId = :resumeId;",
-                        parameters=[
-                            {'name': 'resumeUrl', 'value': {'stringValue': resume_url}},
-                            {'name': 'resumeId', 'value': {'longValue': resume_id}}
-                        ]
-                    )
-                    return resume_id
-
-            response = rds_data_client.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql="INSERT INTO Resume (userId, jobId, resumeUrl) VALUES (:userId, :jobId, :resumeUrl);",
-                parameters=[
-                    {'name': 'userId', 'value': {'longValue': user_id}},
-                    {'name': 'jobId', 'value': {'longValue': job_id}},
-                    {'name': 'resumeUrl', 'value': {'stringValue': resume_url}}
-                ],
-                includeResultMetadata=True
-            )
-            resume_id = response['generatedFields'][0]['longValue']
-            print(f"New resume record inserted with resumeId: {resume_id}")
-            return resume_id
-
-        else:
-            response = rds_data_client.execute_statement(
-                resourceArn=cluster_arn,
-                secretArn=secret_arn,
-                database=database_name,
-                sql="INSERT INTO Resume (userId, jobId, resumeUrl) VALUES (:userId, :jobId, :resumeUrl);",
-                parameters=[
-                    {'name': 'userId', 'value': {'longValue': user_id}},
-                    {'name': 'jobId', 'value': {'longValue': job_id}},
-                    {'name': 'resumeUrl', 'value': {'stringValue': resume_url}}
-                ],
-                includeResultMetadata=True
-            )
-            resume_id = response['generatedFields'][0]['longValue']
-            return resume_id
-
+        upsert_resume(user_id, job_id, resume_url, transaction_id)
+        create_application(user_id, job_id, transaction_id)
+        commit_transaction(transaction_id)
     except Exception as e:
-        print(f"Error processing resume record: {str(e)}")
-        return None
+        print(f"Error saving application: {str(e)}")
+        rollback_transaction(transaction_id)
+        raise
 
 
-def create_application(user_id, job_id, resume_id):
+def upsert_resume(user_id, job_id, resume_url, transaction_id=None):
+    # Resume has a unique (userId, jobId) key, so re-applying replaces the URL in place
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="INSERT INTO Application (userId, jobId, resumeId) VALUES (:userId, :jobId, :resumeId);",
+        execute_statement(
+            sql="INSERT INTO Resume (userId, jobId, resumeUrl) VALUES (:userId, :jobId, :resumeUrl) ON DUPLICATE KEY UPDATE resumeUrl = VALUES(resumeUrl), updatedAt = CURRENT_TIMESTAMP;",
             parameters=[
                 {'name': 'userId', 'value': {'longValue': user_id}},
                 {'name': 'jobId', 'value': {'longValue': job_id}},
-                {'name': 'resumeId', 'value': {'longValue': resume_id}}
-            ]
+                {'name': 'resumeUrl', 'value': {'stringValue': resume_url}}
+            ],
+            **transaction_args(transaction_id)
         )
-        print(f"Application created successfully: {response}")
     except Exception as e:
-        print(f"Error creating application: {str(e)}")
+        print(f"Error processing resume record: {str(e)}")
         raise
 
 
-def check_user_exists(user_id):
+def create_application(user_id, job_id, transaction_id=None):
+    # Application has a unique (userId, jobId) key as well: the legacy base64 path saves the row
+    # and its upload then reaches the finalizer, which saves it again, so the second write (or an
+    # event redelivery) only points the existing application at the resume
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SELECT 1 FROM User WHERE userId = :userId;",
+        response = execute_statement(
+            sql="INSERT INTO Application (userId, jobId, resumeId) SELECT userId, jobId, resumeId FROM Resume WHERE userId = :userId AND jobId = :jobId ON DUPLICATE KEY UPDATE resumeId = VALUES(resumeId);",
             parameters=[
-                {'name': 'userId', 'value': {'longValue': user_id}}
-            ]
+                {'name': 'userId', 'value': {'longValue': user_id}},
+                {'name': 'jobId', 'value': {'longValue': job_id}}
+            ],
+            **transaction_args(transaction_id)
         )
-        return len(response['records']) > 0
+        print(f"Application saved successfully: {response}")
     except Exception as e:
-        print(f"Error checking user existence: {str(e)}")
+        print(f"Error creating application: {str(e)}")
         raise
 
 
-def check_job_exists(job_id):
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SELECT 1 FROM Job WHERE jobId = :jobId;",
-            parameters=[
-                {'name': 'jobId', 'value': {'longValue': job_id}}
-            ]
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking job existence: {str(e)}")
-        raise
\ No newline at end of file
+def transaction_args(transaction_id):
+    return {'transactionId': transaction_id} if transaction_id else {}
@@ -0,0 +1,57 @@
+import json
+from dataAccess import execute_statement
+from quizQuestions import insert_quiz_questions
+
+BATCH_SIZE = 200
+# Stop early enough to return the cursor before the function times out
+MIN_REMAINING_MILLIS = 30000
+
+
+def lambda_handler(event, context):
+    # Copies Quiz.questionIds into QuizQuestion. Resumable: pass back the returned lastQuizId as afterQuizId.
+    try:
+        last_quiz_id = int(event.get('afterQuizId', 0))
+        migrated = 0
+
+        while True:
+            if context and context.get_remaining_time_in_millis() < MIN_REMAINING_MILLIS:
+                return {
+                    'statusCode': 200,
+                    'body': json.dumps({'done': False, 'lastQuizId': last_quiz_id, 'migrated': migrated})
+                }
+
+            quizzes = get_quiz_batch(last_quiz_id)
+            if not quizzes:
+                break
+
+            for quiz_id, question_ids in quizzes:
+                if question_ids:
+                    insert_quiz_questions(quiz_id, question_ids)
+                    migrated += 1
+                last_quiz_id = quiz_id
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'done': True, 'lastQuizId': last_quiz_id, 'migrated': migrated})
+        }
+    except Exception as e:
+        print(f"Error backfilling quiz questions: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps(f'Error backfilling quiz questions: {str(e)}')
+        }
+
+
+def get_quiz_batch(after_quiz_id):
+    # Only quizzes without QuizQuestion rows, so a re-run skips what is already migrated
+    response = execute_statement(
+        sql="SELECT id, questionIds FROM Quiz q WHERE id > :after AND NOT EXISTS (SELECT 1 FROM QuizQuestion qq WHERE qq.quizId = q.id) ORDER BY id LIMIT :limit",
+        parameters=[
+            {'name': 'after', 'value': {'longValue': after_quiz_id}},
+            {'name': 'limit', 'value': {'longValue': BATCH_SIZE}}
+        ]
+    )
+    return [
+        (record[0]['longValue'], json.loads(record[1]['stringValue']) if 'stringValue' in record[1] else [])
+        for record in response['records']
+    ]
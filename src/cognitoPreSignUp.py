@@ -1,14 +1,5 @@
 import json
-import boto3
-import os
-
-# Initialize the RDS Data Client
-rds_data_client = boto3.client('rds-data')
-
-# Environment variables for the RDS cluster
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement
 
 def lambda_handler(event, context):
     try:
@@ -29,10 +20,7 @@ def lambda_handler(event, context):
 
 def insert_user(user_name, first_name, last_name, email):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="INSERT INTO User (userName, firstName, lastName, email, role, createdAt, updatedAt) VALUES (:userName, :firstName, :lastName, :email, :role, NOW(), NOW());",
             parameters=[
                 {'name': 'userName', 'value': {'stringValue': user_name}},
@@ -1,6 +1,6 @@
-import boto3
 import os
 import json
+from awsClients import get_client
 from botocore.exceptions import ClientError
 
 
@@ -13,8 +13,6 @@ def lambda_handler(event, context):
     }
 
     try:
-        client = boto3.client('cognito-idp')
-
         # Handle preflight OPTIONS requests
         if event['httpMethod'] == 'OPTIONS':
             return {
@@ -42,7 +40,7 @@ def lambda_handler(event, context):
         password = body["password"]
 
         # Initiate authentication with Cognito
-        response = client.initiate_auth(
+        response = get_client('cognito-idp').initiate_auth(
             ClientId=os.environ['CLIENT_ID'],
             AuthFlow='USER_PASSWORD_AUTH',
             AuthParameters={
@@ -1,12 +1,5 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
@@ -15,7 +8,7 @@ def lambda_handler(event, context):
         location = body.get('location', '')
         description = body.get('description', '')
 
-        database_exists = check_database_exists()
+        database_exists = table_exists('Company')
 
         if database_exists:
             insert_company(name, location, description)
@@ -35,25 +28,9 @@ def lambda_handler(event, context):
             'body': json.dumps('Error processing request')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Company';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 def insert_company(name, location, description):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="INSERT INTO Company (name, location, description) VALUES (:name, :location, :description);",
             parameters=[
                 {'name': 'name', 'value': {'stringValue': name}},
@@ -1,12 +1,6 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import table_exists
+from resultMapper import query_rows
 
 def lambda_handler(event, context):
     company_id = event.get('pathParameters', {}).get('companyId')
@@ -18,7 +12,7 @@ def lambda_handler(event, context):
         }
 
     try:
-        database_exists = check_database_exists()
+        database_exists = table_exists('Company')
         if database_exists:
             company = get_company(company_id)
             if company:
@@ -43,43 +37,15 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Company';"
-        )
-
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 def get_company(company_id):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SELECT * FROM Company WHERE companyId = :companyId;",
+        rows = query_rows(
+            sql="SELECT companyId, name, location, description FROM Company WHERE companyId = :companyId;",
             parameters=[
                 {'name': 'companyId', 'value': {'longValue': int(company_id)}}
             ]
         )
-
-        if response['records']:
-            record = response['records'][0]
-            company = {
-                'companyId': record[0]['longValue'],
-                'name': record[1]['stringValue'],
-                'location': record[2]['stringValue'] if 'stringValue' in record[2] else None,
-                'description': record[3]['stringValue'] if 'stringValue' in record[3] else None
-            }
-            return company
-        else:
-            return None
+        return rows[0] if rows else None
     except Exception as e:
         print(f"Error fetching company from database: {str(e)}")
         raise
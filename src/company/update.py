@@ -1,12 +1,5 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
@@ -22,7 +15,7 @@ def lambda_handler(event, context):
                 'body': json.dumps('At least one field (name, location, description) must be provided for update.')
             }
 
-        database_exists = check_database_exists()
+        database_exists = table_exists('Company')
         if database_exists:
             updated = update_company(company_id, name, location, description)
             if updated:
@@ -47,20 +40,6 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Company';"
-        )
-
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 def update_company(company_id, name, location, description):
     try:
         sql = "UPDATE Company SET "
@@ -81,10 +60,7 @@ def update_company(company_id, name, location, description):
         sql += " WHERE companyId = :companyId;"
         parameters.append({'name': 'companyId', 'value': {'longValue': int(company_id)}})
 
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql=sql,
             parameters=parameters
         )
@@ -1,17 +1,10 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
         # Ensure the table exists
-        if not check_database_exists():
+        if not table_exists('Job'):
             return {
                 'statusCode': 500,
                 'body': json.dumps('Table does not exist in the database.')
@@ -43,10 +36,7 @@ def lambda_handler(event, context):
 
 def insert_job(title, description, requirements, company_id):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="INSERT INTO Job (title, description, requirements, companyId) VALUES (:title, :description, :requirements, :companyId);",
             parameters=[
                 {'name': 'title', 'value': {'stringValue': title}},
@@ -59,16 +49,3 @@ def insert_job(title, description, requirements, company_id):
     except Exception as e:
         print(f"Error inserting job: {str(e)}")
         raise
-
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Job';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
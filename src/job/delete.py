@@ -1,17 +1,10 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
         job_id = event['pathParameters']['jobId']
-        database_exists = check_database_exists()
+        database_exists = table_exists('Job')
 
         if database_exists:
             if delete_job(job_id):
@@ -36,26 +29,9 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Job';"
-        )
-
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 def delete_job(job_id):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="DELETE FROM Job WHERE jobId = :jobId;",
             parameters=[
                 {'name': 'jobId', 'value': {'longValue': int(job_id)}}
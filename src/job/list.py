@@ -0,0 +1,32 @@
+import json
+from dataAccess import table_exists
+from pagination import list_rows
+
+JOB_COLUMNS = ['jobId', 'title', 'description', 'requirements', 'companyId']
+
+
+def lambda_handler(event, context):
+    try:
+        if not table_exists('Job'):
+            return {
+                'statusCode': 404,
+                'body': json.dumps('Database table "Job" does not exist.')
+            }
+
+        page = list_rows('Job', 'jobId', JOB_COLUMNS, event.get('queryStringParameters'),
+                         filters={'companyId': 'longValue'})
+        return {
+            'statusCode': 200,
+            'body': json.dumps(page)
+        }
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'body': json.dumps(str(e))
+        }
+    except Exception as e:
+        print(f"Error listing job: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
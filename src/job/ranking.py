@@ -0,0 +1,57 @@
+import json
+from dataAccess import table_exists
+from pagination import MAX_LIMIT, parse_int
+from resultMapper import query_rows
+
+DEFAULT_TOP = 10
+
+
+def lambda_handler(event, context):
+    try:
+        job_id = parse_int(event['pathParameters']['jobId'], 'jobId', None)
+        query = event.get('queryStringParameters') or {}
+        limit = parse_int(query.get('limit'), 'limit', DEFAULT_TOP)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f'limit must be between 1 and {MAX_LIMIT}.')
+
+        if not table_exists('JobRanking'):
+            return {
+                'statusCode': 404,
+                'body': json.dumps('Database table "JobRanking" does not exist.')
+            }
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'jobId': job_id, 'ranking': get_ranking(job_id, limit)})
+        }
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'body': json.dumps(str(e))
+        }
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
+
+
+def get_ranking(job_id, limit):
+    # Walks idxJobRankingScore backwards from the best score, so only the top rows are read
+    try:
+        rows = query_rows(
+            sql="SELECT r.userId, u.firstName, u.lastName, r.bestScore, r.attempts, r.lastAttemptAt FROM JobRanking r JOIN User u ON u.userId = r.userId WHERE r.jobId = :jobId ORDER BY r.bestScore DESC, r.userId DESC LIMIT :limit",
+            parameters=[
+                {'name': 'jobId', 'value': {'longValue': job_id}},
+                {'name': 'limit', 'value': {'longValue': limit}}
+            ]
+        )
+        for rank, row in enumerate(rows, start=1):
+            row['rank'] = rank
+            # DECIMAL columns arrive as strings from the Data API
+            row['bestScore'] = float(row['bestScore'])
+        return rows
+    except Exception as e:
+        print(f"Error retrieving job ranking: {str(e)}")
+        raise
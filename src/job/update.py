@@ -1,12 +1,5 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
@@ -23,7 +16,7 @@ def lambda_handler(event, context):
                 'body': json.dumps('At least one field (title, description, requirements, companyId) must be provided for update.')
             }
 
-        database_exists = check_database_exists()
+        database_exists = table_exists('Job')
         if database_exists:
             updated = update_job(job_id, title, description, requirements, company_id)
             if updated:
@@ -48,19 +41,6 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Job';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 def update_job(job_id, title, description, requirements, company_id):
     try:
         sql = "UPDATE Job SET "
@@ -84,10 +64,7 @@ def update_job(job_id, title, description, requirements, company_id):
         sql += " WHERE jobId = :jobId;"
         parameters.append({'name': 'jobId', 'value': {'longValue': int(job_id)}})
 
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql=sql,
             parameters=parameters
         )
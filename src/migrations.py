@@ -0,0 +1,319 @@
+from dataAccess import database_name, execute_statement
+
+# Numbered schema migrations applied in order by initializeDatabase. Applied versions are
+# recorded in SchemaVersion; every step is safe to re-run, since MySQL DDL is not transactional
+# and a migration interrupted halfway is retried from its first step.
+
+
+def column_exists(table_name, column_name):
+    try:
+        response = execute_statement(
+            sql="SELECT COUNT(*) FROM information_schema.columns WHERE table_schema = :schema AND table_name = :table AND column_name = :column",
+            parameters=[
+                {'name': 'schema', 'value': {'stringValue': database_name}},
+                {'name': 'table', 'value': {'stringValue': table_name}},
+                {'name': 'column', 'value': {'stringValue': column_name}}
+            ]
+        )
+        return response['records'][0][0]['longValue'] > 0
+    except Exception as e:
+        print(f"Error checking if column {table_name}.{column_name} exists: {str(e)}")
+        raise
+
+
+def index_exists(table_name, index_name):
+    try:
+        response = execute_statement(
+            sql="SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = :schema AND table_name = :table AND index_name = :index",
+            parameters=[
+                {'name': 'schema', 'value': {'stringValue': database_name}},
+                {'name': 'table', 'value': {'stringValue': table_name}},
+                {'name': 'index', 'value': {'stringValue': index_name}}
+            ]
+        )
+        return response['records'][0][0]['longValue'] > 0
+    except Exception as e:
+        print(f"Error checking if index {table_name}.{index_name} exists: {str(e)}")
+        raise
+
+
+def run_sql(statement):
+    def step():
+        execute_statement(sql=statement)
+    return step
+
+
+def add_column(table_name, column_name, definition):
+    def step():
+        if not column_exists(table_name, column_name):
+            execute_statement(sql=f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition};")
+            print(f"Added column: {table_name}.{column_name}")
+    return step
+
+
+def add_index(table_name, index_name, columns, unique=False):
+    def step():
+        if not index_exists(table_name, index_name):
+            kind = 'UNIQUE INDEX' if unique else 'INDEX'
+            execute_statement(sql=f"CREATE {kind} {index_name} ON {table_name} ({columns});")
+            print(f"Added index: {table_name}.{index_name}")
+    return step
+
+
+BASE_TABLES = {
+    "User": """
+        CREATE TABLE IF NOT EXISTS User (
+            userId INT AUTO_INCREMENT PRIMARY KEY,
+            firstName VARCHAR(255) NOT NULL,
+            lastName VARCHAR(255) NOT NULL,
+            userName VARCHAR(255) NOT NULL,
+            email VARCHAR(255) NOT NULL UNIQUE,
+            role VARCHAR(50) NOT NULL,
+            createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        );
+    """,
+    "Company": """
+        CREATE TABLE IF NOT EXISTS Company (
+            companyId INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            location VARCHAR(255),
+            description TEXT
+        );
+    """,
+    "Profile": """
+        CREATE TABLE IF NOT EXISTS Profile (
+            profileId INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL
+        );
+    """,
+    "Job": """
+        CREATE TABLE IF NOT EXISTS Job (
+            jobId INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            description TEXT,
+            requirements TEXT,
+            companyId INT,
+            FOREIGN KEY (companyId) REFERENCES Company(companyId) ON DELETE SET NULL
+        );
+    """,
+    "Quiz": """
+        CREATE TABLE IF NOT EXISTS Quiz (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            profileId INT,
+            description TEXT,
+            jobId INT,
+            questionIds TEXT,
+            createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            userId INT,
+            timer INT,
+            numberQuestions INT,
+            answerKey JSON,
+            FOREIGN KEY (profileId) REFERENCES Profile(profileId) ON DELETE SET NULL,
+            FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE SET NULL,
+            FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE SET NULL
+        );
+    """,
+    "Questions": """
+        CREATE TABLE IF NOT EXISTS Questions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            profileId INT,
+            text TEXT NOT NULL,
+            type VARCHAR(50),
+            options TEXT,
+            answer TEXT,
+            createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (profileId) REFERENCES Profile(profileId) ON DELETE SET NULL
+        );
+    """,
+    "Resume": """
+        CREATE TABLE IF NOT EXISTS Resume (
+            resumeId INT AUTO_INCREMENT PRIMARY KEY,
+            userId INT,
+            jobId INT,
+            resumeUrl VARCHAR(255),
+            uploadedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY uniqueUserJob (userId, jobId),
+            FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE,
+            FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE SET NULL
+        );
+    """,
+    "Application": """
+        CREATE TABLE IF NOT EXISTS Application (
+            applicationId INT AUTO_INCREMENT PRIMARY KEY,
+            userId INT,
+            jobId INT,
+            resumeId INT,
+            status VARCHAR(50),
+            submittedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE,
+            FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE SET NULL,
+            FOREIGN KEY (resumeId) REFERENCES Resume(resumeId) ON DELETE SET NULL
+        );
+    """,
+    "QuizHistory": """
+        CREATE TABLE IF NOT EXISTS QuizHistory (
+            historyId INT AUTO_INCREMENT PRIMARY KEY,
+            userId INT,
+            quizId INT,
+            score DECIMAL(5, 2),
+            status VARCHAR(50),
+            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            correctAnswers INT,
+            totalQuestions INT,
+            scorePercentage DECIMAL(5, 2),
+            notAnsweredOrFalse INT,
+            results JSON,
+            submissionId VARCHAR(64) UNIQUE,
+            FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE,
+            FOREIGN KEY (quizId) REFERENCES Quiz(id) ON DELETE CASCADE
+        );
+    """
+}
+
+
+# Rows moved aside when a unique key is added over existing duplicates. No foreign keys or unique
+# keys, so an archived row is kept whatever happens to the user, job or resume it referred to.
+ARCHIVE_TABLES = {
+    "ResumeArchive": """
+        CREATE TABLE IF NOT EXISTS ResumeArchive (
+            resumeId INT PRIMARY KEY,
+            userId INT,
+            jobId INT,
+            resumeUrl VARCHAR(255),
+            uploadedAt TIMESTAMP NULL,
+            updatedAt TIMESTAMP NULL,
+            archivedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "ApplicationArchive": """
+        CREATE TABLE IF NOT EXISTS ApplicationArchive (
+            applicationId INT PRIMARY KEY,
+            userId INT,
+            jobId INT,
+            resumeId INT,
+            status VARCHAR(100),
+            submittedAt TIMESTAMP NULL,
+            archivedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """
+}
+
+
+MIGRATIONS = [
+    (1, 'Create base tables', [run_sql(statement) for statement in BASE_TABLES.values()]),
+    (2, 'Add columns and keys introduced after the first release', [
+        add_column('Quiz', 'answerKey', 'JSON'),
+        add_column('QuizHistory', 'submissionId', 'VARCHAR(64) UNIQUE'),
+        # Older databases can hold several resumes per user and job. All but the latest move to
+        # ResumeArchive and their applications point to the latest, so the unique key can be added.
+        run_sql(ARCHIVE_TABLES['ResumeArchive']),
+        run_sql("""
+            INSERT IGNORE INTO ResumeArchive (resumeId, userId, jobId, resumeUrl, uploadedAt, updatedAt)
+            SELECT DISTINCT r.resumeId, r.userId, r.jobId, r.resumeUrl, r.uploadedAt, r.updatedAt
+            FROM Resume r JOIN Resume k ON k.userId = r.userId AND k.jobId = r.jobId AND k.resumeId > r.resumeId;
+        """),
+        run_sql("""
+            UPDATE Application a JOIN ResumeArchive r ON r.resumeId = a.resumeId
+            SET a.resumeId = (SELECT MAX(k.resumeId) FROM Resume k WHERE k.userId = r.userId AND k.jobId = r.jobId);
+        """),
+        run_sql("DELETE r FROM Resume r JOIN ResumeArchive x ON x.resumeId = r.resumeId;"),
+        add_index('Resume', 'uniqueUserJob', 'userId, jobId', unique=True)
+    ]),
+    (3, 'Add secondary indexes for hot handler queries', [
+        add_index('Questions', 'idxQuestionsProfileType', 'profileId, type'),
+        add_index('QuizHistory', 'idxQuizHistoryUserQuiz', 'userId, quizId'),
+        add_index('QuizHistory', 'idxQuizHistoryQuizDate', 'quizId, date'),
+        add_index('Application', 'idxApplicationJob', 'jobId, submittedAt')
+    ]),
+    (4, 'Add QuizQuestion join table', [
+        # questionId has no foreign key so deleting a question keeps the record of where it was served
+        run_sql("""
+            CREATE TABLE IF NOT EXISTS QuizQuestion (
+                quizId INT NOT NULL,
+                position INT NOT NULL,
+                questionId INT NOT NULL,
+                PRIMARY KEY (quizId, position),
+                INDEX idxQuizQuestionQuestion (questionId),
+                FOREIGN KEY (quizId) REFERENCES Quiz(id) ON DELETE CASCADE
+            );
+        """)
+    ]),
+    (5, 'Add timed quiz sessions', [
+        # Quizzes created before this migration have no expiresAt and are never swept
+        add_column('Quiz', 'startedAt', 'TIMESTAMP NULL'),
+        add_column('Quiz', 'expiresAt', 'TIMESTAMP NULL'),
+        add_column('Quiz', 'status', "VARCHAR(20) NOT NULL DEFAULT 'open'"),
+        add_index('Quiz', 'idxQuizStatusExpires', 'status, expiresAt')
+    ]),
+    (6, 'Add JobRanking aggregate', [
+        run_sql("""
+            CREATE TABLE IF NOT EXISTS JobRanking (
+                jobId INT NOT NULL,
+                userId INT NOT NULL,
+                bestScore DECIMAL(5, 2) NOT NULL,
+                attempts INT NOT NULL,
+                lastAttemptAt TIMESTAMP NULL,
+                PRIMARY KEY (jobId, userId),
+                INDEX idxJobRankingScore (jobId, bestScore, userId),
+                FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE CASCADE,
+                FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE
+            );
+        """),
+        # Seed from the attempts stored so far; later results keep it current through quizResults
+        run_sql("""
+            INSERT INTO JobRanking (jobId, userId, bestScore, attempts, lastAttemptAt)
+            SELECT q.jobId, h.userId, MAX(h.scorePercentage), COUNT(*), MAX(h.date)
+            FROM QuizHistory h JOIN Quiz q ON q.id = h.quizId
+            WHERE q.jobId IS NOT NULL AND h.userId IS NOT NULL
+            GROUP BY q.jobId, h.userId
+            ON DUPLICATE KEY UPDATE bestScore = VALUES(bestScore), attempts = VALUES(attempts), lastAttemptAt = VALUES(lastAttemptAt);
+        """)
+    ]),
+    (7, 'Add QuestionStats counters', [
+        # No foreign key: results for a deleted question may still arrive and must not fail the write
+        run_sql("""
+            CREATE TABLE IF NOT EXISTS QuestionStats (
+                questionId INT PRIMARY KEY,
+                timesServed INT NOT NULL DEFAULT 0,
+                timesAnswered INT NOT NULL DEFAULT 0,
+                timesCorrect INT NOT NULL DEFAULT 0,
+                totalCredit DOUBLE NOT NULL DEFAULT 0,
+                timedAnswers INT NOT NULL DEFAULT 0,
+                totalAnswerSeconds DOUBLE NOT NULL DEFAULT 0,
+                updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            );
+        """),
+        # Serves can be counted from QuizQuestion; answer counters start from the next graded result
+        run_sql("""
+            INSERT INTO QuestionStats (questionId, timesServed)
+            SELECT questionId, COUNT(*) FROM QuizQuestion GROUP BY questionId
+            ON DUPLICATE KEY UPDATE timesServed = VALUES(timesServed);
+        """)
+    ]),
+    (8, 'Add pre-generated quiz pools', [
+        # Pooled quizzes have no candidate until one claims them
+        run_sql("ALTER TABLE Quiz MODIFY COLUMN userId INT NULL;"),
+        add_column('Quiz', 'claimToken', 'VARCHAR(36) NULL'),
+        add_index('Quiz', 'uniqueQuizClaimToken', 'claimToken', unique=True),
+        add_index('Quiz', 'idxQuizPool', 'status, profileId, jobId, numberQuestions')
+    ]),
+    (9, 'Add question payload versions', [
+        # Null until the question's payload is published for the CDN
+        add_column('Questions', 'payloadVersion', 'VARCHAR(16) NULL')
+    ]),
+    (10, 'Make applications unique per user and job', [
+        # Both resume upload paths save the application. Of any duplicates the earliest row stays;
+        # the others move to ApplicationArchive before the unique key is added.
+        run_sql(ARCHIVE_TABLES['ApplicationArchive']),
+        run_sql("""
+            INSERT IGNORE INTO ApplicationArchive (applicationId, userId, jobId, resumeId, status, submittedAt)
+            SELECT DISTINCT a.applicationId, a.userId, a.jobId, a.resumeId, a.status, a.submittedAt
+            FROM Application a JOIN Application b ON b.userId = a.userId AND b.jobId = a.jobId AND b.applicationId < a.applicationId;
+        """),
+        run_sql("DELETE a FROM Application a JOIN ApplicationArchive x ON x.applicationId = a.applicationId;"),
+        add_index('Application', 'uniqueApplicationUserJob', 'userId, jobId', unique=True)
+    ])
+]
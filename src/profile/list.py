@@ -0,0 +1,31 @@
+import json
+from dataAccess import table_exists
+from pagination import list_rows
+
+PROFILE_COLUMNS = ['profileId', 'title']
+
+
+def lambda_handler(event, context):
+    try:
+        if not table_exists('Profile'):
+            return {
+                'statusCode': 404,
+                'body': json.dumps('Database "Profile" does not exist.')
+            }
+
+        page = list_rows('Profile', 'profileId', PROFILE_COLUMNS, event.get('queryStringParameters'))
+        return {
+            'statusCode': 200,
+            'body': json.dumps(page)
+        }
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'body': json.dumps(str(e))
+        }
+    except Exception as e:
+        print(f"Error listing profile: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
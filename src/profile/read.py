@@ -1,12 +1,6 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import table_exists
+from resultMapper import query_rows
 
 
 def lambda_handler(event, context):
@@ -19,7 +13,7 @@ def lambda_handler(event, context):
         }
 
     try:
-        database_exists = check_database_exists()
+        database_exists = table_exists('Profile')
         if database_exists:
             profile = get_profile(profile_id)
             if profile:
@@ -44,43 +38,16 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Profile';"
-        )
-
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 
 def get_profile(profile_id):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SELECT * FROM Profile WHERE profileId = :profileId;",
+        rows = query_rows(
+            sql="SELECT profileId AS id, title FROM Profile WHERE profileId = :profileId;",
             parameters=[
                 {'name': 'profileId', 'value': {'longValue': int(profile_id)}}
             ]
         )
-
-        if response['records']:
-            # Convert the response to a dictionary
-            record = response['records'][0]
-            profile = {
-                'id': record[0]['longValue'],
-                'title': record[1]['stringValue']
-            }
-            return profile
-        else:
-            return None
+        return rows[0] if rows else None
     except Exception as e:
         print(f"Error fetching profile from database: {str(e)}")
         raise
@@ -1,12 +1,5 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
@@ -19,7 +12,7 @@ def lambda_handler(event, context):
                 'statusCode': 400,
                 'body': json.dumps('Missing title in request body.')
             }
-        database_exists = check_database_exists()
+        database_exists = table_exists('Profile')
         if database_exists:
             updated = update_profile(profile_id, title)
             if updated:
@@ -44,26 +37,9 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Profile';"
-        )
-
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking database existence: {str(e)}")
-        raise
-
 def update_profile(profile_id, title):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="UPDATE Profile SET title = :title WHERE profileId = :profileId;",
             parameters=[
                 {'name': 'title', 'value': {'stringValue': title}},
@@ -0,0 +1,169 @@
+import codecs
+import csv
+import json
+import os
+from awsClients import get_client
+from dataAccess import (batch_execute_statement, begin_transaction, commit_transaction, execute_statement,
+                        rollback_transaction, table_exists)
+
+
+# Files are only read from the stack's import bucket; callers name a key, never a bucket
+import_bucket = os.environ.get('IMPORT_BUCKET')
+
+# Rows are written in chunks as the file is read, so memory stays flat whatever its size
+CHUNK_SIZE = 200
+MAX_REPORTED_ERRORS = 1000
+
+INSERT_QUESTION_SQL = "INSERT INTO Questions (profileId, text, type, options, answer) VALUES (:profileId, :text, :type, :options, :answer);"
+
+
+def lambda_handler(event, context):
+    try:
+        if not table_exists('Questions'):
+            return {
+                'statusCode': 500,
+                'body': json.dumps('Table does not exist in the database.')
+            }
+
+        # API requests carry a body; direct invocations pass the S3 location as the event itself
+        body = event.get('body')
+        source = parse_s3_source(body) if body is not None else event
+        if source and source.get('s3Key'):
+            if source.get('s3Bucket') not in (None, import_bucket):
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps('Files are read from the import bucket; pass only s3Key.')
+                }
+            rows = read_s3_rows(source['s3Key'])
+        elif body:
+            rows = read_json_lines(body.splitlines())
+        else:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('A JSON Lines body or an s3Key is required.')
+            }
+
+        summary = import_questions(rows)
+        return {
+            'statusCode': 200,
+            'body': json.dumps(summary)
+        }
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
+
+
+def parse_s3_source(body):
+    try:
+        source = json.loads(body)
+    except ValueError:
+        return None
+    return source if isinstance(source, dict) and 's3Key' in source else None
+
+
+def read_s3_rows(key):
+    stream = codecs.getreader('utf-8')(get_client('s3').get_object(Bucket=import_bucket, Key=key)['Body'])
+    if key.lower().endswith('.csv'):
+        return read_csv(stream)
+    return read_json_lines(stream)
+
+
+def read_json_lines(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {str(e)}"
+
+
+def read_csv(stream):
+    # options and answer columns hold JSON, as in the single-question endpoint
+    reader = csv.DictReader(stream)
+    for row in reader:
+        line_number = reader.line_num
+        try:
+            row['options'] = json.loads(row['options']) if row.get('options') else None
+            row['answer'] = json.loads(row['answer']) if row.get('answer') else None
+            yield line_number, row, None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON in options or answer: {str(e)}"
+
+
+def validate_question(question):
+    if not isinstance(question, dict):
+        return 'Row must be an object.'
+    try:
+        if question.get('profileId') in (None, ''):
+            return 'Profile ID is required.'
+        int(question['profileId'])
+    except (TypeError, ValueError):
+        return 'Profile ID must be an integer.'
+    if not question.get('text'):
+        return 'Question text is required.'
+    if not question.get('type'):
+        return 'Question type is required.'
+    if question.get('options') is None:
+        return 'Options are required.'
+    if question.get('answer') is None:
+        return 'Answer is required.'
+    return None
+
+
+def to_parameter_set(question):
+    return [
+        {'name': 'profileId', 'value': {'longValue': int(question['profileId'])}},
+        {'name': 'text', 'value': {'stringValue': question['text']}},
+        {'name': 'type', 'value': {'stringValue': question['type']}},
+        {'name': 'options', 'value': {'stringValue': json.dumps(question['options'])}},
+        {'name': 'answer', 'value': {'stringValue': json.dumps(question['answer'])}}
+    ]
+
+
+def import_questions(rows):
+    summary = {'inserted': 0, 'failed': 0, 'errors': []}
+    chunk = []
+
+    def add_error(line_number, message):
+        summary['failed'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'line': line_number, 'error': message})
+
+    def flush():
+        if not chunk:
+            return
+        # A batch outside a transaction can stop partway, so each chunk is all or nothing. When it
+        # fails, its rows are retried one at a time and only the rows that fail again are reported.
+        transaction_id = begin_transaction()
+        try:
+            batch_execute_statement(INSERT_QUESTION_SQL, [parameter_set for _, parameter_set in chunk],
+                                    transactionId=transaction_id)
+            commit_transaction(transaction_id)
+            summary['inserted'] += len(chunk)
+        except Exception as e:
+            print(f"Error inserting question batch, retrying row by row: {str(e)}")
+            rollback_transaction(transaction_id)
+            for line_number, parameter_set in chunk:
+                try:
+                    execute_statement(sql=INSERT_QUESTION_SQL, parameters=parameter_set)
+                    summary['inserted'] += 1
+                except Exception as row_error:
+                    add_error(line_number, f"Insert failed: {str(row_error)}")
+        chunk.clear()
+
+    for line_number, question, error in rows:
+        error = error or validate_question(question)
+        if error:
+            add_error(line_number, error)
+            continue
+
+        chunk.append((line_number, to_parameter_set(question)))
+        if len(chunk) >= CHUNK_SIZE:
+            flush()
+
+    flush()
+    return summary
@@ -1,16 +1,9 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
-        if not check_table_exists('Questions'):
+        if not table_exists('Questions'):
             return {
                 'statusCode': 500,
                 'body': json.dumps('Table does not exist in the database.')
@@ -63,10 +56,7 @@ def lambda_handler(event, context):
 
 def insert_question(profile_id, text, q_type, options, answer):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="INSERT INTO Questions (profileId, text, type, options, answer) VALUES (:profileId, :text, :type, :options, :answer);",
             parameters=[
                 {'name': 'profileId', 'value': {'longValue': profile_id}},
@@ -80,16 +70,3 @@ def insert_question(profile_id, text, q_type, options, answer):
     except Exception as e:
         print(f"Error inserting question: {str(e)}")
         raise
-
-def check_table_exists(table_name):
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql=f"SHOW TABLES LIKE '{table_name}';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking table existence: {str(e)}")
-        raise
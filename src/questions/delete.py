@@ -1,17 +1,10 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
         question_id = event['pathParameters']['questionsId']
-        if check_database_exists():
+        if table_exists('Questions'):
             if delete_question(question_id):
                 return {
                     'statusCode': 200,
@@ -34,25 +27,9 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Questions';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking table existence: {str(e)}")
-        raise
-
 def delete_question(question_id):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql="DELETE FROM Questions WHERE id = :id;",
             parameters=[
                 {'name': 'id', 'value': {'longValue': int(question_id)}}
@@ -0,0 +1,36 @@
+import json
+from apiCaller import is_admin
+from dataAccess import table_exists
+from pagination import list_rows
+
+QUESTIONS_COLUMNS = ['id', 'profileId', 'text', 'type', 'options', 'createdAt', 'updatedAt']
+# Answers are never in the default projection; admins can ask for them with fields=...,answer
+ADMIN_COLUMNS = ('answer',)
+
+
+def lambda_handler(event, context):
+    try:
+        if not table_exists('Questions'):
+            return {
+                'statusCode': 404,
+                'body': json.dumps('Table "Questions" does not exist.')
+            }
+
+        page = list_rows('Questions', 'id', QUESTIONS_COLUMNS, event.get('queryStringParameters'),
+                         filters={'profileId': 'longValue', 'type': 'stringValue'}, json_columns=('options', 'answer'),
+                         extra_columns=ADMIN_COLUMNS if is_admin(event) else ())
+        return {
+            'statusCode': 200,
+            'body': json.dumps(page)
+        }
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'body': json.dumps(str(e))
+        }
+    except Exception as e:
+        print(f"Error listing questions: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
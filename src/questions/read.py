@@ -1,18 +1,23 @@
 import json
-import boto3
-import os
+from apiCaller import is_admin
+from dataAccess import table_exists
+from questionStats import stats_summary
+from resultMapper import query_rows
 
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+STATS_COLUMNS = ('timesServed', 'timesAnswered', 'timesCorrect', 'totalCredit', 'timedAnswers', 'totalAnswerSeconds')
 
 def lambda_handler(event, context):
     try:
         question_id = event['pathParameters']['questionsId']
-        if check_database_exists():
-            question = get_question(question_id)
+        # The answer is left out unless an admin asks for it explicitly
+        include_answer = (event.get('queryStringParameters') or {}).get('includeAnswer') == 'true'
+        if include_answer and not is_admin(event):
+            return {
+                'statusCode': 403,
+                'body': json.dumps('Only admins can read question answers.')
+            }
+        if table_exists('Questions'):
+            question = get_question(question_id, include_answer)
             if question:
                 return {
                     'statusCode': 200,
@@ -35,44 +40,22 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_database_exists():
+def get_question(question_id, include_answer=False):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Questions';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking table existence: {str(e)}")
-        raise
-
-def get_question(question_id):
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SELECT * FROM Questions WHERE id = :id;",
+        # Counters come from QuestionStats by primary key; questions never served have no row yet
+        answer_column = 'q.answer, ' if include_answer else ''
+        rows = query_rows(
+            sql=f"SELECT q.id, q.profileId, q.text, q.type, q.options, {answer_column}q.createdAt, q.updatedAt, s.timesServed, s.timesAnswered, s.timesCorrect, s.totalCredit, s.timedAnswers, s.totalAnswerSeconds FROM Questions q LEFT JOIN QuestionStats s ON s.questionId = q.id WHERE q.id = :id;",
             parameters=[
                 {'name': 'id', 'value': {'longValue': int(question_id)}}
-            ]
+            ],
+            json_columns=('options', 'answer')
         )
-        records = response['records']
-        if records:
-            return {
-                'id': records[0][0]['longValue'],
-                'profileId': records[0][1]['longValue'],
-                'text': records[0][2]['stringValue'],
-                'type': records[0][3]['stringValue'],
-                'options': json.loads(records[0][4]['stringValue']),
-                'answer': json.loads(records[0][5]['stringValue']),
-                'createdAt': records[0][6]['stringValue'],
-                'updatedAt': records[0][7]['stringValue']
-            }
-        else:
+        if not rows:
             return None
+        question = rows[0]
+        question['stats'] = stats_summary(*(question.pop(column) for column in STATS_COLUMNS))
+        return question
     except Exception as e:
         print(f"Error retrieving question: {str(e)}")
         raise
@@ -1,12 +1,5 @@
 import json
-import boto3
-import os
-
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+from dataAccess import execute_statement, table_exists
 
 def lambda_handler(event, context):
     try:
@@ -23,7 +16,7 @@ def lambda_handler(event, context):
                 'body': json.dumps('At least one field (text, type, options, answer) must be provided for update.')
             }
 
-        database_exists = check_table_exists()
+        database_exists = table_exists('Questions')
         if database_exists:
             updated = update_question(question_id, text, q_type, options, answer)
             if updated:
@@ -48,19 +41,6 @@ def lambda_handler(event, context):
             'body': json.dumps('Internal server error.')
         }
 
-def check_table_exists():
-    try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SHOW TABLES LIKE 'Questions';"
-        )
-        return len(response['records']) > 0
-    except Exception as e:
-        print(f"Error checking table existence: {str(e)}")
-        raise
-
 def update_question(question_id, text, q_type, options, answer):
     try:
         sql = "UPDATE Questions SET "
@@ -79,14 +59,16 @@ def update_question(question_id, text, q_type, options, answer):
             sql += "answer = :answer, "
             parameters.append({'name': 'answer', 'value': {'stringValue': json.dumps(answer)}})
 
-        sql = sql.rstrip(', ')
+        # A new payload is published under a new version the next time the question is served
+        if text or q_type or options:
+            sql += "payloadVersion = NULL, "
+
+        # Set explicitly so every backend moves it; graders compare it with their cached copy
+        sql += "updatedAt = CURRENT_TIMESTAMP"
         sql += " WHERE id = :id;"
         parameters.append({'name': 'id', 'value': {'longValue': int(question_id)}})
 
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
+        response = execute_statement(
             sql=sql,
             parameters=parameters
         )
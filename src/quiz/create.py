@@ -1,25 +1,29 @@
 import json
-import boto3
 import os
-import random
+import uuid
+from dataAccess import begin_transaction, commit_transaction, execute_statement, rollback_transaction
+from questionPayloads import content_columns, quiz_manifest
+from questionStats import record_served
+from quizAssembly import assemble_quiz, build_constraints, seen_question_ids
+from quizQuestions import insert_quiz_questions
+from quizSessions import session_window, timestamp_parameter
 
-rds_data_client = boto3.client('rds-data')
-
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+# When enabled, each quiz stores its own answer key so grading reads a single Quiz row
+snapshot_answer_key = os.environ.get('SNAPSHOT_ANSWER_KEY', 'false').lower() == 'true'
 
 
 def lambda_handler(event, context):
     try:
         body = json.loads(event.get('body', '{}'))
         profile_id = body.get('profileId')
+        # Several profiles may be combined; the quiz row records the first one
+        profile_ids = body.get('profileIds') or ([profile_id] if profile_id is not None else [])
         number_questions = body.get('numberQuestions')
         timer = body.get('timer')
         user_id = body.get('userId')
         job_id = body.get('jobId')
 
-        if profile_id is None:
+        if not profile_ids:
             return {
                 'statusCode': 400,
                 'body': json.dumps('Profile ID is required.')
@@ -29,7 +33,8 @@ def lambda_handler(event, context):
                 'statusCode': 400,
                 'body': json.dumps('Number of questions is required.')
             }
-        if timer is None:
+        # The timer now sets the session deadline, so only the supported durations are accepted
+        if timer not in (20, 30):
             return {
                 'statusCode': 400,
                 'body': json.dumps('Timer must be either 20 or 30 minutes.')
@@ -45,24 +50,55 @@ def lambda_handler(event, context):
                 'body': json.dumps('Job ID is required.')
             }
 
-        questions = get_random_question_details(profile_id, number_questions)
-        if not questions:
+        try:
+            constraints = build_constraints(profile_ids, number_questions, body.get('types'), body.get('difficulty'))
+        except ValueError as e:
             return {
-                'statusCode': 404,
-                'body': json.dumps('Not enough questions found for the specified profile.')
+                'statusCode': 400,
+                'body': json.dumps(str(e))
             }
+        profile_id = constraints['profileIds'][0]
+
+        # The session starts now; grading rejects submissions that arrive after expiresAt
+        started_at, expires_at = session_window(timer)
+
+        # Plain requests take a pre-generated quiz when the pool for their combination has one left
+        quiz_id, questions = None, None
+        if is_poolable(body, constraints):
+            quiz_id, questions = claim_pooled_quiz(profile_id, job_id, number_questions, user_id, timer,
+                                                   started_at, expires_at)
+            if quiz_id is not None:
+                count_served([q['id'] for q in questions])
 
-        question_ids = [q['id'] for q in questions]
-        quiz_id = create_quiz(profile_id, job_id, question_ids, user_id, timer, number_questions)
+        if quiz_id is None:
+            # Opt-in: leave out every question the candidate met in an earlier quiz
+            excluded_ids = seen_question_ids(user_id) if body.get('excludeSeen') else frozenset()
+            questions = get_random_question_details(constraints, excluded_ids)
+            if not questions:
+                return {
+                    'statusCode': 404,
+                    'body': json.dumps('Not enough questions found for the specified profile and constraints.')
+                }
+
+            question_ids = [q['id'] for q in questions]
+            answer_key = [[q['id'], q['answer'], q['type']] for q in questions] if snapshot_answer_key else None
+            quiz_id = create_quiz(profile_id, job_id, question_ids, user_id, timer, number_questions, answer_key,
+                                  started_at, expires_at)
+            insert_quiz_questions(quiz_id, question_ids)
+            count_served(question_ids)
 
         quiz_details = {
             'quizId': quiz_id,
             'profileId': profile_id,
+            'profileIds': constraints['profileIds'],
             'jobId': job_id,
-            'questions': questions,
+            # Ids, order and payload URLs only; answers never leave the server
+            'questions': quiz_manifest(questions),
             'userId': user_id,
             'timer': timer,
-            'numberQuestions': number_questions
+            'numberQuestions': number_questions,
+            'startedAt': started_at,
+            'expiresAt': expires_at
         }
 
         return {
@@ -77,59 +113,144 @@ def lambda_handler(event, context):
         }
 
 
-def get_random_question_details(profile_id, number_questions):
+def is_poolable(body, constraints):
+    # Pooled quizzes are drawn from one profile without constraints or a per-candidate exclusion
+    return (len(constraints['profileIds']) == 1 and not constraints['typeCounts']
+            and constraints['difficultyCounts'] is None and not body.get('excludeSeen'))
+
+
+def claim_pooled_quiz(profile_id, job_id, number_questions, user_id, timer, started_at, expires_at):
+    # One UPDATE on idxQuizPool hands the first pooled quiz to this candidate. MySQL 5.7 has no
+    # UPDATE ... RETURNING, so the claim writes a token that the read below finds by its unique index.
+    # Both run in one transaction, so a failed read rolls the claim back and the quiz stays pooled.
     try:
-        query = """
-        SELECT id, text, type, options, answer 
-        FROM Questions 
-        WHERE profileId = :profileId 
-        ORDER BY RAND() 
-        LIMIT :limit
-        """
-
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql=query,
+        claim_token = str(uuid.uuid4())
+        transaction_id = begin_transaction()
+        try:
+            quiz_id, questions = claim_and_read(claim_token, profile_id, job_id, number_questions, user_id, timer,
+                                                started_at, expires_at, transaction_id)
+            commit_transaction(transaction_id)
+        except Exception:
+            rollback_transaction(transaction_id)
+            raise
+        return quiz_id, questions
+    except Exception as e:
+        print(f"Error claiming pooled quiz: {str(e)}")
+        raise
+
+
+def claim_and_read(claim_token, profile_id, job_id, number_questions, user_id, timer, started_at, expires_at,
+                   transaction_id):
+    response = execute_statement(
+        sql="UPDATE Quiz SET userId = :userId, timer = :timer, startedAt = :startedAt, expiresAt = :expiresAt, status = 'open', claimToken = :claimToken WHERE status = 'pooled' AND profileId = :profileId AND jobId = :jobId AND numberQuestions = :numberQuestions LIMIT 1",
+        parameters=[
+            {'name': 'userId', 'value': {'longValue': user_id}},
+            {'name': 'timer', 'value': {'longValue': timer}},
+            timestamp_parameter('startedAt', started_at),
+            timestamp_parameter('expiresAt', expires_at),
+            {'name': 'claimToken', 'value': {'stringValue': claim_token}},
+            {'name': 'profileId', 'value': {'longValue': profile_id}},
+            {'name': 'jobId', 'value': {'longValue': job_id}},
+            {'name': 'numberQuestions', 'value': {'longValue': number_questions}}
+        ],
+        transactionId=transaction_id
+    )
+    if response['numberOfRecordsUpdated'] == 0:
+        return None, None
+
+    response = execute_statement(
+        sql=f"SELECT z.id, q.id, q.type, q.payloadVersion, {content_columns('q')}, q.updatedAt FROM Quiz z JOIN QuizQuestion qq ON qq.quizId = z.id JOIN Questions q ON q.id = qq.questionId WHERE z.claimToken = :claimToken ORDER BY qq.position",
+        parameters=[
+            {'name': 'claimToken', 'value': {'stringValue': claim_token}}
+        ],
+        transactionId=transaction_id
+    )
+    records = response['records']
+    if not records:
+        # Its questions are gone; put back, the quiz would head the pool on every later claim
+        execute_statement(
+            sql="UPDATE Quiz SET status = 'discarded', userId = NULL, claimToken = NULL WHERE claimToken = :claimToken",
             parameters=[
-                {'name': 'profileId', 'value': {'longValue': profile_id}},
-                {'name': 'limit', 'value': {'longValue': number_questions}}
-            ]
+                {'name': 'claimToken', 'value': {'stringValue': claim_token}}
+            ],
+            transactionId=transaction_id
         )
+        return None, None
+    return records[0][0]['longValue'], [question_from_fields(record[1:]) for record in records]
 
-        all_questions = [
-            {
-                'id': record[0]['longValue'],
-                'text': record[1]['stringValue'],
-                'type': record[2]['stringValue'],
-                'options': json.loads(record[3]['stringValue']),
-                'answer': json.loads(record[4]['stringValue'])
-            }
-            for record in response['records']
-        ]
 
-        return all_questions if len(all_questions) == number_questions else None
+def count_served(question_ids):
+    try:
+        record_served(question_ids)
+    except Exception:
+        # A lost serve count only skews the statistics, so it does not fail the quiz
+        pass
+
+
+def get_random_question_details(constraints, excluded_ids=frozenset()):
+    try:
+        question_ids, fresh = assemble_quiz(constraints, excluded_ids)
+        questions = fetch_questions(question_ids) if question_ids else None
+
+        # A stale index may miss new questions or hold deleted ones; retry once against the database
+        if questions is None and not fresh:
+            question_ids, fresh = assemble_quiz(constraints, excluded_ids, refresh=True)
+            questions = fetch_questions(question_ids) if question_ids else None
+
+        return questions
 
     except Exception as e:
         print(f"Error retrieving questions: {str(e)}")
         raise
 
 
-def create_quiz(profile_id, job_id, question_ids, user_id, timer, number_questions):
+def fetch_questions(sampled_ids):
+    ids_placeholder = ','.join([f':id{i}' for i in range(len(sampled_ids))])
+    response = execute_statement(
+        sql=f"SELECT q.id, q.type, q.payloadVersion, {content_columns('q')}, q.updatedAt, q.answer FROM Questions q WHERE q.id IN ({ids_placeholder})",
+        parameters=[{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(sampled_ids)]
+    )
+
+    questions_by_id = {}
+    for record in response['records']:
+        question = question_from_fields(record)
+        question['answer'] = json.loads(record[6]['stringValue'])
+        questions_by_id[question['id']] = question
+
+    if len(questions_by_id) != len(sampled_ids):
+        return None
+    return [questions_by_id[q_id] for q_id in sampled_ids]
+
+
+def question_from_fields(fields):
+    # id, type, payloadVersion, then text and options, which are null once the payload is published,
+    # then updatedAt, which publishing checks so an edit made meanwhile is not marked as published
+    return {
+        'id': fields[0]['longValue'],
+        'type': fields[1].get('stringValue'),
+        'payloadVersion': fields[2].get('stringValue'),
+        'text': fields[3].get('stringValue'),
+        'options': json.loads(fields[4]['stringValue']) if 'stringValue' in fields[4] else None,
+        'updatedAt': fields[5].get('stringValue')
+    }
+
+
+def create_quiz(profile_id, job_id, question_ids, user_id, timer, number_questions, answer_key=None,
+                started_at=None, expires_at=None, status='open'):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="INSERT INTO Quiz (profileId, jobId, questionIds, userId, timer, numberQuestions) VALUES (:profileId, :jobId, :questionIds, :userId, :timer, :numberQuestions);",
+        response = execute_statement(
+            sql="INSERT INTO Quiz (profileId, jobId, questionIds, userId, timer, numberQuestions, answerKey, startedAt, expiresAt, status) VALUES (:profileId, :jobId, :questionIds, :userId, :timer, :numberQuestions, :answerKey, :startedAt, :expiresAt, :status);",
             parameters=[
                 {'name': 'profileId', 'value': {'longValue': profile_id}},
                 {'name': 'jobId', 'value': {'longValue': job_id}},
                 {'name': 'questionIds', 'value': {'stringValue': json.dumps(question_ids)}},
-                {'name': 'userId', 'value': {'longValue': user_id}},
+                {'name': 'userId', 'value': {'longValue': user_id} if user_id is not None else {'isNull': True}},
                 {'name': 'timer', 'value': {'longValue': timer}},
-                {'name': 'numberQuestions', 'value': {'longValue': number_questions}}
+                {'name': 'numberQuestions', 'value': {'longValue': number_questions}},
+                {'name': 'answerKey', 'value': {'stringValue': json.dumps(answer_key)} if answer_key else {'isNull': True}},
+                timestamp_parameter('startedAt', started_at) if started_at else {'name': 'startedAt', 'value': {'isNull': True}},
+                timestamp_parameter('expiresAt', expires_at) if expires_at else {'name': 'expiresAt', 'value': {'isNull': True}},
+                {'name': 'status', 'value': {'stringValue': status}}
             ]
         )
         return response['generatedFields'][0]['longValue']
@@ -0,0 +1,106 @@
+import json
+from apiCaller import is_admin
+from create import create_quiz, get_random_question_details, snapshot_answer_key
+from dataAccess import execute_statement
+from questionPayloads import payloads_enabled, publish_payloads
+from quizAssembly import build_constraints
+from quizQuestions import insert_quiz_questions
+
+# Pre-generates quizzes for a (profileId, jobId, numberQuestions) combination ahead of a hiring
+# event. They are stored with status 'pooled' and no candidate; CreateQuizFunction claims one
+# with a single UPDATE instead of sampling and inserting while the burst is under way.
+MAX_POOL_BATCH = 200
+
+
+def lambda_handler(event, context):
+    try:
+        if not is_admin(event):
+            return {
+                'statusCode': 403,
+                'body': json.dumps('Only admins can generate quiz pools.')
+            }
+
+        body = json.loads(event.get('body', '{}'))
+        profile_id = body.get('profileId')
+        job_id = body.get('jobId')
+        number_questions = body.get('numberQuestions')
+        count = body.get('count')
+
+        if job_id is None:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Job ID is required.')
+            }
+        if isinstance(count, bool) or not isinstance(count, int) or not 1 <= count <= MAX_POOL_BATCH:
+            return {
+                'statusCode': 400,
+                'body': json.dumps(f'Count must be between 1 and {MAX_POOL_BATCH}.')
+            }
+        try:
+            constraints = build_constraints([profile_id], number_questions)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'body': json.dumps(str(e))
+            }
+
+        generated = generate_pool(profile_id, job_id, number_questions, count, constraints)
+        if not generated:
+            return {
+                'statusCode': 404,
+                'body': json.dumps('Not enough questions found for the specified profile.')
+            }
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'profileId': profile_id,
+                'jobId': job_id,
+                'numberQuestions': number_questions,
+                'generated': generated,
+                'available': count_pooled(profile_id, job_id, number_questions)
+            })
+        }
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
+
+
+def generate_pool(profile_id, job_id, number_questions, count, constraints):
+    # Sampling reuses the container's question index, so each quiz costs one read and two writes.
+    # Serves are counted when a candidate claims the quiz, not here.
+    generated = 0
+    for _ in range(count):
+        questions = get_random_question_details(constraints)
+        if not questions:
+            break
+        question_ids = [q['id'] for q in questions]
+        answer_key = [[q['id'], q['answer'], q['type']] for q in questions] if snapshot_answer_key else None
+        # The timer and session window are set when a candidate claims the quiz
+        quiz_id = create_quiz(profile_id, job_id, question_ids, None, 0, number_questions, answer_key,
+                              status='pooled')
+        insert_quiz_questions(quiz_id, question_ids)
+        # Published now, so claiming the quiz during the event has nothing left to upload
+        if payloads_enabled():
+            publish_payloads([q for q in questions if not q['payloadVersion']])
+        generated += 1
+    return generated
+
+
+def count_pooled(profile_id, job_id, number_questions):
+    try:
+        response = execute_statement(
+            sql="SELECT COUNT(*) FROM Quiz WHERE status = 'pooled' AND profileId = :profileId AND jobId = :jobId AND numberQuestions = :numberQuestions",
+            parameters=[
+                {'name': 'profileId', 'value': {'longValue': profile_id}},
+                {'name': 'jobId', 'value': {'longValue': job_id}},
+                {'name': 'numberQuestions', 'value': {'longValue': number_questions}}
+            ]
+        )
+        return response['records'][0][0]['longValue']
+    except Exception as e:
+        print(f"Error counting pooled quizzes: {str(e)}")
+        raise
@@ -0,0 +1,243 @@
+import codecs
+import json
+import os
+import uuid
+from awsClients import get_client
+from dataAccess import execute_statement
+from grading import compile_answer_key
+from quizAnswersValidation import score_submission
+from quizResults import build_pass_message, quiz_history_parameters, store_quiz_histories
+from quizSessions import is_expired
+
+
+sns_topic_arn = os.environ['SNS_TOPIC_ARN']
+# Submission files are only read from the stack's import bucket; callers name a key, never a bucket
+import_bucket = os.environ['IMPORT_BUCKET']
+
+# Submissions are graded and written a chunk at a time; quizzes and questions loaded for one
+# chunk stay in memory for the rest of the file, since a cohort usually shares a few quizzes.
+CHUNK_SIZE = 200
+MAX_IDS_PER_QUERY = 500
+MAX_REPORTED_ERRORS = 1000
+SNS_BATCH_SIZE = 10
+
+
+def lambda_handler(event, context):
+    try:
+        # API requests carry the S3 key in the body; direct invocations pass it as the event
+        source = json.loads(event['body']) if event.get('body') else event
+        if not source.get('s3Key'):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('An s3Key is required.')
+            }
+        if source.get('s3Bucket') not in (None, import_bucket):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Files are read from the import bucket; pass only s3Key.')
+            }
+
+        summary = grade_file(source['s3Key'])
+        return {
+            'statusCode': 200,
+            'body': json.dumps(summary)
+        }
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'body': json.dumps('Invalid JSON body.')
+        }
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Internal server error.')
+        }
+
+
+def grade_file(key):
+    stream = codecs.getreader('utf-8')(get_client('s3').get_object(Bucket=import_bucket, Key=key)['Body'])
+    grader = BatchGrader(f"s3://{import_bucket}/{key}")
+    chunk = []
+    for line_number, submission, error in read_json_lines(stream):
+        if error:
+            grader.add_error(line_number, error)
+            continue
+        chunk.append((line_number, submission))
+        if len(chunk) >= CHUNK_SIZE:
+            grader.grade_chunk(chunk)
+            chunk = []
+    grader.grade_chunk(chunk)
+    return grader.summary
+
+
+def read_json_lines(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {str(e)}"
+
+
+def validate_submission(submission):
+    if not isinstance(submission, dict):
+        return 'Row must be an object.'
+    if not isinstance(submission.get('quizId'), int):
+        return 'Quiz ID is required.'
+    if not isinstance(submission.get('userId'), int):
+        return 'User ID is required.'
+    if not submission.get('responses'):
+        return 'Responses are required.'
+    return None
+
+
+class BatchGrader:
+    def __init__(self, source):
+        self.source = source
+        self.loaded_quiz_ids = set()
+        self.snapshot_questions = {}
+        self.quiz_question_ids = {}
+        self.quiz_sessions = {}
+        self.questions = {}
+        self.summary = {'graded': 0, 'passed': 0, 'alreadyStored': 0, 'failed': 0, 'errors': []}
+
+    def add_error(self, line_number, message):
+        self.summary['failed'] += 1
+        if len(self.summary['errors']) < MAX_REPORTED_ERRORS:
+            self.summary['errors'].append({'line': line_number, 'error': message})
+
+    def grade_chunk(self, chunk):
+        if not chunk:
+            return
+        valid = []
+        for line_number, submission in chunk:
+            error = validate_submission(submission)
+            if error:
+                self.add_error(line_number, error)
+            else:
+                valid.append((line_number, submission))
+
+        self.load_quizzes({submission['quizId'] for _, submission in valid})
+
+        parameter_sets = []
+        notifications = []
+        line_numbers = {}
+        for line_number, submission in valid:
+            questions = self.quiz_questions(submission['quizId'])
+            if not questions:
+                self.add_error(line_number, 'Quiz not found.')
+                continue
+            session_error = self.session_error(submission['quizId'])
+            if session_error:
+                self.add_error(line_number, session_error)
+                continue
+
+            results, correct_count, total_questions, score_percentage, status = score_submission(
+                submission['responses'], questions)
+            # Derived from the file and line unless given, so re-running a file does not store results twice
+            submission_id = submission.get('submissionId') or str(uuid.uuid5(uuid.NAMESPACE_URL, f"{self.source}#{line_number}"))
+            line_numbers[submission_id] = line_number
+            parameter_sets.append(quiz_history_parameters(
+                submission['userId'], submission['quizId'], score_percentage, status, correct_count,
+                total_questions, total_questions - correct_count, results, submission_id))
+            if status == 'Pass':
+                notifications.append((submission_id, {
+                    'userId': submission['userId'],
+                    'quizId': submission['quizId'],
+                    'message': build_pass_message(score_percentage)
+                }))
+
+        if parameter_sets:
+            # Each quiz is moved to submitted with its result, as /validatequiz does, so the session
+            # takes no later submission and is not swept. Submissions stored by an earlier run are
+            # neither counted nor notified again.
+            new_ids, rejected_ids = store_quiz_histories(parameter_sets, claim_status='submitted')
+            for submission_id in rejected_ids:
+                self.add_error(line_numbers[submission_id], 'Quiz has already been submitted or closed.')
+            notifications = [notification for submission_id, notification in notifications if submission_id in new_ids]
+            self.summary['graded'] += len(new_ids)
+            self.summary['alreadyStored'] += len(parameter_sets) - len(new_ids) - len(rejected_ids)
+            self.summary['passed'] += len(notifications)
+            publish_notifications(notifications)
+
+    def load_quizzes(self, quiz_ids):
+        missing_quiz_ids = [quiz_id for quiz_id in quiz_ids if quiz_id not in self.loaded_quiz_ids]
+        missing_question_ids = set()
+        for ids in split(missing_quiz_ids, MAX_IDS_PER_QUERY):
+            response = execute_statement(
+                sql=f"SELECT id, questionIds, answerKey, status, expiresAt FROM Quiz WHERE id IN ({placeholders(ids)})",
+                parameters=id_parameters(ids)
+            )
+            for record in response['records']:
+                quiz_id = record[0]['longValue']
+                self.quiz_sessions[quiz_id] = (record[3].get('stringValue'), record[4].get('stringValue'))
+                answer_key = json.loads(record[2]['stringValue']) if 'stringValue' in record[2] else None
+                if answer_key:
+                    self.snapshot_questions[quiz_id] = [
+                        {'id': entry[0], 'grade': compile_answer_key(entry[2] if len(entry) > 2 else None, entry[1])}
+                        for entry in answer_key
+                    ]
+                else:
+                    question_ids = json.loads(record[1]['stringValue'])
+                    self.quiz_question_ids[quiz_id] = question_ids
+                    missing_question_ids.update(q_id for q_id in question_ids if q_id not in self.questions)
+            self.loaded_quiz_ids.update(ids)
+
+        for ids in split(list(missing_question_ids), MAX_IDS_PER_QUERY):
+            response = execute_statement(
+                sql=f"SELECT id, type, answer FROM Questions WHERE id IN ({placeholders(ids)})",
+                parameters=id_parameters(ids)
+            )
+            for record in response['records']:
+                question_id = record[0]['longValue']
+                self.questions[question_id] = {
+                    'id': question_id,
+                    'grade': compile_answer_key(record[1].get('stringValue'), json.loads(record[2]['stringValue']))
+                }
+
+    def session_error(self, quiz_id):
+        # Checked against the loaded status to skip grading; the claim made with the insert decides.
+        # A submitted quiz is left to that claim, so re-running a file reports alreadyStored.
+        status, expires_at = self.quiz_sessions.get(quiz_id, (None, None))
+        if status == 'pooled':
+            return 'Quiz not found.'
+        if status == 'expired' or (status == 'open' and is_expired(expires_at)):
+            return 'Quiz time has expired.'
+        return None
+
+    def quiz_questions(self, quiz_id):
+        if quiz_id in self.snapshot_questions:
+            return self.snapshot_questions[quiz_id]
+        question_ids = self.quiz_question_ids.get(quiz_id, [])
+        return [self.questions[q_id] for q_id in question_ids if q_id in self.questions]
+
+
+def split(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def placeholders(ids):
+    return ','.join(f':id{i}' for i in range(len(ids)))
+
+
+def id_parameters(ids):
+    return [{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(ids)]
+
+
+def publish_notifications(notifications):
+    # SNS takes up to ten messages per call; sqsConsumer emails each one as for single submissions
+    for batch in split(notifications, SNS_BATCH_SIZE):
+        try:
+            response = get_client('sns').publish_batch(
+                TopicArn=sns_topic_arn,
+                PublishBatchRequestEntries=[
+                    {'Id': str(position), 'Message': json.dumps(notification)}
+                    for position, notification in enumerate(batch)
+                ]
+            )
+            for failure in response.get('Failed', []):
+                print(f"Error publishing notification {failure['Id']}: {failure.get('Message')}")
+        except Exception as e:
+            print(f"Error publishing notification batch: {str(e)}")
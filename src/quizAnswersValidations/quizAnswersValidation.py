@@ -1,14 +1,34 @@
 import json
-import boto3
 import os
+import uuid
+from awsClients import get_client
+from cache import TTLCache
+from dataAccess import begin_transaction, commit_transaction, execute_statement, rollback_transaction
+from grading import compile_answer_key
+from questionStats import answer_seconds
+from quizQuestions import get_quiz_questions
+from quizResults import build_pass_message, insert_quiz_history, refresh_job_ranking
+from quizSessions import claim_quiz, is_expired
 
-rds_data_client = boto3.client('rds-data')
-sns_client = boto3.client('sns')
 
 sns_topic_arn = os.environ['SNS_TOPIC_ARN']
-cluster_arn = os.environ['CLUSTER_ARN']
-secret_arn = os.environ['SECRET_ARN']
-database_name = os.environ['DB_NAME']
+
+# When enabled, the history insert and pass notification are handed to the SNS -> SQS pipeline
+# and written by sqsConsumer, so the candidate only waits for grading and one publish.
+async_results = os.environ.get('ASYNC_RESULTS', 'false').lower() == 'true'
+
+# Graded questions kept across warm invocations; only ids missing from the cache hit the database.
+# The quiz read also returns each question's updatedAt, so an entry older than the row is reloaded
+# without an extra round trip; the TTL only bounds memory.
+QUESTION_CACHE_SIZE = 5000
+QUESTION_CACHE_TTL_SECONDS = 300
+question_cache = TTLCache(QUESTION_CACHE_SIZE, QUESTION_CACHE_TTL_SECONDS)
+
+# Compiled snapshot answer keys per quiz. A snapshot never changes, so entries only age out to bound memory.
+ANSWER_KEY_CACHE_SIZE = 1000
+answer_key_cache = TTLCache(ANSWER_KEY_CACHE_SIZE, QUESTION_CACHE_TTL_SECONDS)
+
+PASSING_PERCENTAGE = 0.70
 
 
 def lambda_handler(event, context):
@@ -34,46 +54,92 @@ def lambda_handler(event, context):
             }
 
         quiz_details = get_quiz_details(quiz_id)
-        if not quiz_details:
+        # A pooled quiz has not been handed to a candidate yet, so nobody can submit it
+        if not quiz_details or quiz_details['status'] == 'pooled':
             return {
                 'statusCode': 404,
                 'body': json.dumps('Quiz not found.')
             }
 
-        questions = get_questions_by_ids(quiz_details['questionIds'])
+        # Timed sessions accept one submission, before the deadline; older quizzes have no expiresAt
+        timed = quiz_details['expiresAt'] is not None
+        if timed and quiz_details['status'] != 'open':
+            return {
+                'statusCode': 409,
+                'body': json.dumps('Quiz has already been submitted or closed.')
+            }
+        if timed and is_expired(quiz_details['expiresAt']):
+            return {
+                'statusCode': 403,
+                'body': json.dumps('Quiz time has expired.')
+            }
+
+        # Quizzes created with SNAPSHOT_ANSWER_KEY carry their own answers, frozen at creation time
+        if quiz_details['answerKey']:
+            questions = get_snapshot_questions(quiz_id, quiz_details['answerKey'])
+        else:
+            questions = get_questions_by_ids(quiz_id, quiz_details['questionIds'], quiz_details['versions'])
         if not questions:
             return {
                 'statusCode': 404,
                 'body': json.dumps('Questions not found.')
             }
 
-        results, correct_count, total_questions = check_answers(responses, questions)
+        results, correct_count, total_questions, score_percentage, status = score_submission(responses, questions)
+        passed = status == 'Pass'
+        submission_id = str(uuid.uuid4())
 
-        passing_percentage = 0.70
-        score_percentage = (correct_count / total_questions) * 100
-        passed = score_percentage >= passing_percentage * 100
+        # Claimed only after grading, in the transaction that stores or hands off the result: any
+        # failure before the commit rolls the claim back and leaves the session open for a retry
+        transaction_id = begin_transaction()
+        try:
+            if timed and not claim_quiz(quiz_id, transaction_id):
+                rollback_transaction(transaction_id)
+                return {
+                    'statusCode': 409,
+                    'body': json.dumps('Quiz has already been submitted, closed or has expired.')
+                }
 
-        store_quiz_history(user_id, quiz_id, score_percentage, 'Pass' if passed else 'Fail', correct_count,
-                           total_questions, total_questions - correct_count, results)
-        if passed:
-            message = {
-                'message': f'Congratulations! You have passed with a score of {score_percentage}%.'
-            }
-            sns_client.publish(
-                TopicArn=sns_topic_arn,
-                Message=json.dumps(message)
-            )
+            if async_results:
+                # sqsConsumer stores the result idempotently, so a commit failing after the publish
+                # at worst lets the candidate submit once more
+                publish_quiz_result(submission_id, user_id, quiz_id, score_percentage, status, correct_count,
+                                    total_questions, total_questions - correct_count, results)
+            else:
+                insert_quiz_history(transaction_id, user_id, quiz_id, score_percentage, status, correct_count,
+                                    total_questions, total_questions - correct_count, results, submission_id)
+                refresh_job_ranking([(user_id, quiz_id)], transaction_id)
+            commit_transaction(transaction_id)
+        except Exception:
+            rollback_transaction(transaction_id)
+            raise
+
+        if passed and not async_results:
+            # The result is committed; a lost email must not turn it into an error the candidate retries
+            try:
+                message = {
+                    'userId': user_id,
+                    'quizId': quiz_id,
+                    'message': build_pass_message(score_percentage)
+                }
+                get_client('sns').publish(
+                    TopicArn=sns_topic_arn,
+                    Message=json.dumps(message)
+                )
+            except Exception as e:
+                print(f"Error publishing pass notification: {str(e)}")
 
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Answers checked successfully!',
+                'submissionId': submission_id,
                 'results': results,
                 'scorePercentage': score_percentage,
                 'totalQuestions': total_questions,
                 'correctAnswers': correct_count,
                 'notAnsweredOrFalse': total_questions - correct_count,
-                'status': 'Pass' if passed else 'Fail'
+                'status': status
             })
         }
     except Exception as e:
@@ -85,12 +151,11 @@ def lambda_handler(event, context):
 
 
 def get_quiz_details(quiz_id):
+    # One row per question through QuizQuestion, carrying the question's updatedAt for the cache check;
+    # quizzes not yet backfilled come back as a single row without versions
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="SELECT questionIds FROM Quiz WHERE id = :quizId",
+        response = execute_statement(
+            sql="SELECT z.questionIds, z.answerKey, z.expiresAt, z.status, q.id, q.updatedAt FROM Quiz z LEFT JOIN QuizQuestion qq ON qq.quizId = z.id LEFT JOIN Questions q ON q.id = qq.questionId WHERE z.id = :quizId",
             parameters=[
                 {'name': 'quizId', 'value': {'longValue': quiz_id}}
             ]
@@ -99,93 +164,149 @@ def get_quiz_details(quiz_id):
         if not records:
             return None
         question_ids = json.loads(records[0][0]['stringValue'])
-        return {'questionIds': question_ids}
+        answer_key = json.loads(records[0][1]['stringValue']) if 'stringValue' in records[0][1] else None
+        return {
+            'questionIds': question_ids,
+            'answerKey': answer_key,
+            'expiresAt': records[0][2].get('stringValue'),
+            'status': records[0][3].get('stringValue'),
+            'versions': {record[4]['longValue']: record[5].get('stringValue') for record in records if 'longValue' in record[4]}
+        }
     except Exception as e:
         print(f"Error retrieving quiz details: {str(e)}")
         raise
 
 
-def get_questions_by_ids(question_ids):
+def get_questions_by_ids(quiz_id, question_ids, versions):
     try:
-        ids_placeholder = ','.join([f':id{i}' for i in range(len(question_ids))])
-        query = f"SELECT id, text, answer FROM Questions WHERE id IN ({ids_placeholder})"
+        cached_questions, missing_ids = question_cache.get_many(question_ids)
+        # An entry whose updatedAt differs from the row's, or that cannot be checked, is a miss
+        for q_id, question in list(cached_questions.items()):
+            if question['updatedAt'] is None or question['updatedAt'] != versions.get(q_id):
+                del cached_questions[q_id]
+                missing_ids.append(q_id)
 
-        parameters = [{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(question_ids)]
-
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql=query,
-            parameters=parameters
-        )
-
-        questions = [
-            {
-                'id': record[0]['longValue'],
-                'text': record[1]['stringValue'],
-                'answer': json.loads(record[2]['stringValue'])
-            }
-            for record in response['records']
-        ]
+        if missing_ids:
+            # On a cold cache the QuizQuestion join reads the whole quiz in one fixed-shape statement;
+            # otherwise only the missing ids are read. The IN list also covers quizzes not yet backfilled.
+            fetched_questions = None
+            if not cached_questions:
+                fetched_questions = get_quiz_questions(quiz_id)
+            if not fetched_questions:
+                fetched_questions = fetch_questions(missing_ids)
+            for question in fetched_questions:
+                question['grade'] = compile_answer_key(question['type'], question['answer'])
+                question_cache.set(question['id'], question)
+                cached_questions[question['id']] = question
 
-        return questions
+        return [cached_questions[q_id] for q_id in question_ids if q_id in cached_questions]
     except Exception as e:
         print(f"Error retrieving questions: {str(e)}")
         raise
 
 
+def fetch_questions(question_ids):
+    ids_placeholder = ','.join([f':id{i}' for i in range(len(question_ids))])
+    query = f"SELECT id, text, type, answer, updatedAt FROM Questions WHERE id IN ({ids_placeholder})"
+
+    parameters = [{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(question_ids)]
+
+    response = execute_statement(
+        sql=query,
+        parameters=parameters
+    )
+
+    return [
+        {
+            'id': record[0]['longValue'],
+            'text': record[1]['stringValue'],
+            'type': record[2].get('stringValue'),
+            'answer': json.loads(record[3]['stringValue']),
+            'updatedAt': record[4].get('stringValue')
+        }
+        for record in response['records']
+    ]
+
+
+def get_snapshot_questions(quiz_id, answer_key):
+    questions = answer_key_cache.get(quiz_id)
+    if questions is None:
+        # Entries are [id, answer, type]; keys snapshotted before grading by type have no type
+        questions = [
+            {'id': entry[0], 'answer': entry[1], 'grade': compile_answer_key(entry[2] if len(entry) > 2 else None, entry[1])}
+            for entry in answer_key
+        ]
+        answer_key_cache.set(quiz_id, questions)
+    return questions
+
+
 def check_answers(responses, questions):
-    question_map = {q['id']: q['answer'] for q in questions}
+    question_map = {q['id']: q['grade'] for q in questions}
     results = []
     correct_count = 0
+    earned_credit = 0.0
     total_questions = len(question_map)
     answered_questions = set()
 
     for response in responses:
         question_id = response['questionId']
         user_answer = response['answer']
-        correct_answer = question_map.get(question_id)
+        grade = question_map.get(question_id)
 
         if question_id in answered_questions:
             continue
 
-        if correct_answer is None:
+        if grade is None:
             result = {'questionId': question_id, 'correct': False, 'message': 'Question not found.'}
         else:
-            is_correct = user_answer == correct_answer
+            # Partial credit counts toward the score; only full credit counts as a correct answer
+            credit = grade(user_answer)
+            earned_credit += credit
+            is_correct = credit == 1.0
             if is_correct:
                 correct_count += 1
-            result = {'questionId': question_id, 'correct': is_correct,
-                      'message': 'Correct' if is_correct else 'Incorrect'}
+            result = {'questionId': question_id, 'correct': is_correct, 'credit': credit,
+                      'message': 'Correct' if is_correct else ('Partially correct' if credit > 0 else 'Incorrect')}
+            # Optional, reported by the client; feeds the question's mean time-to-answer
+            time_spent = answer_seconds(response.get('timeSpentSeconds'))
+            if time_spent is not None:
+                result['timeSpentSeconds'] = time_spent
 
         results.append(result)
         answered_questions.add(question_id)
 
-    return results, correct_count, total_questions
+    return results, correct_count, total_questions, earned_credit
+
+
+def score_submission(responses, questions):
+    results, correct_count, total_questions, earned_credit = check_answers(responses, questions)
+    score_percentage = (earned_credit / total_questions) * 100
+    status = 'Pass' if score_percentage >= PASSING_PERCENTAGE * 100 else 'Fail'
+    return results, correct_count, total_questions, score_percentage, status
 
 
-def store_quiz_history(user_id, quiz_id, score_percentage, status, correct_answers, total_questions,
-                       not_answered_or_false, results):
+def publish_quiz_result(submission_id, user_id, quiz_id, score_percentage, status, correct_answers, total_questions,
+                        not_answered_or_false, results):
     try:
-        response = rds_data_client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database_name,
-            sql="INSERT INTO QuizHistory (userId, quizId, score, status, correctAnswers, totalQuestions, scorePercentage, notAnsweredOrFalse, results) VALUES (:userId, :quizId, :score, :status, :correctAnswers, :totalQuestions, :scorePercentage, :notAnsweredOrFalse, :results)",
-            parameters=[
-                {'name': 'userId', 'value': {'longValue': user_id}},
-                {'name': 'quizId', 'value': {'longValue': quiz_id}},
-                {'name': 'score', 'value': {'doubleValue': score_percentage}},
-                {'name': 'status', 'value': {'stringValue': status}},
-                {'name': 'correctAnswers', 'value': {'longValue': correct_answers}},
-                {'name': 'totalQuestions', 'value': {'longValue': total_questions}},
-                {'name': 'scorePercentage', 'value': {'doubleValue': score_percentage}},
-                {'name': 'notAnsweredOrFalse', 'value': {'longValue': not_answered_or_false}},
-                {'name': 'results', 'value': {'stringValue': json.dumps(results)}}
-            ]
+        message = {
+            'type': 'quizResult',
+            'submissionId': submission_id,
+            'userId': user_id,
+            'quizId': quiz_id,
+            'scorePercentage': score_percentage,
+            'status': status,
+            'correctAnswers': correct_answers,
+            'totalQuestions': total_questions,
+            'notAnsweredOrFalse': not_answered_or_false,
+            'results': results
+        }
+        if status == 'Pass':
+            message['message'] = build_pass_message(score_percentage)
+
+        get_client('sns').publish(
+            TopicArn=sns_topic_arn,
+            Message=json.dumps(message)
         )
-        print("Quiz history stored successfully.")
     except Exception as e:
-        print(f"Error storing quiz history: {str(e)}")
+        print(f"Error publishing quiz result: {str(e)}")
         raise
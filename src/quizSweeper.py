@@ -0,0 +1,81 @@
+import json
+from dataAccess import execute_statement
+from quizResults import quiz_history_parameters, store_quiz_histories
+from quizSessions import grace_cutoff, timestamp_parameter
+
+# Closes timed quiz sessions that ran out without a submission and records them as Expired with
+# no answers. Runs on a schedule; each batch is a range read on (status, expiresAt), so only
+# expired open sessions are touched, never the whole Quiz table.
+BATCH_SIZE = 200
+# Stop starting new batches when less time than this is left in the invocation
+MIN_REMAINING_MILLIS = 10000
+
+
+def lambda_handler(event, context):
+    closed = 0
+    cutoff = grace_cutoff()
+    try:
+        while True:
+            quiz_ids = find_expired_quizzes(cutoff)
+            if quiz_ids:
+                closed += close_quizzes(quiz_ids)
+            if len(quiz_ids) < BATCH_SIZE:
+                break
+            if context and context.get_remaining_time_in_millis() < MIN_REMAINING_MILLIS:
+                print("Stopping early; the next run continues from the remaining sessions.")
+                break
+
+        print(f"Closed {closed} expired quiz sessions.")
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'closed': closed})
+        }
+    except Exception as e:
+        print(f"Error sweeping expired quizzes: {str(e)}")
+        raise
+
+
+def find_expired_quizzes(cutoff):
+    response = execute_statement(
+        sql="SELECT id FROM Quiz WHERE status = 'open' AND expiresAt < :cutoff ORDER BY expiresAt LIMIT :limit",
+        parameters=[
+            timestamp_parameter('cutoff', cutoff),
+            {'name': 'limit', 'value': {'longValue': BATCH_SIZE}}
+        ]
+    )
+    return [record[0]['longValue'] for record in response['records']]
+
+
+def close_quizzes(quiz_ids):
+    ids_placeholder = ','.join([f':id{i}' for i in range(len(quiz_ids))])
+    id_parameters = [{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(quiz_ids)]
+
+    response = execute_statement(
+        sql=f"SELECT id, userId, numberQuestions FROM Quiz WHERE id IN ({ids_placeholder})",
+        parameters=id_parameters
+    )
+    records = response['records']
+
+    # Sessions without a candidate have no history to record; the status guard skips any
+    # submitted since they were selected
+    unowned_ids = [record[0]['longValue'] for record in records if 'longValue' not in record[1]]
+    if unowned_ids:
+        execute_statement(
+            sql=f"UPDATE Quiz SET status = 'expired' WHERE id IN ({','.join(f':id{i}' for i in range(len(unowned_ids)))}) AND status = 'open'",
+            parameters=[{'name': f'id{i}', 'value': {'longValue': q_id}} for i, q_id in enumerate(unowned_ids)]
+        )
+
+    # One history row per session, keyed on the quiz so a re-run cannot record it twice. The
+    # session is closed in the transaction that stores the row, so a failed insert leaves it open
+    # for the next sweep, and a session submitted in the meantime is left out.
+    parameter_sets = [
+        quiz_history_parameters(
+            record[1]['longValue'], record[0]['longValue'], 0.0, 'Expired', 0,
+            record[2].get('longValue', 0), record[2].get('longValue', 0), [], f"expired-{record[0]['longValue']}")
+        for record in records if 'longValue' in record[1]
+    ]
+    closed = len(unowned_ids)
+    if parameter_sets:
+        new_ids, _ = store_quiz_histories(parameter_sets, claim_status='expired')
+        closed += len(new_ids)
+    return closed
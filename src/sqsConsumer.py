@@ -1,5 +1,117 @@
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from awsClients import get_client
+from dataAccess import execute_statement
+from quizResults import store_quiz_history
+
+sender_email = os.environ.get('SENDER_EMAIL', '')
+email_backend = os.environ.get('EMAIL_BACKEND', 'ses')
+
+# Records are independent, so a batch is processed on a small thread pool; the work is I/O bound
+MAX_WORKERS = int(os.environ.get('MAX_WORKERS', '10'))
+
+
+class SesEmailSender:
+    def send(self, to_address, subject, body):
+        get_client('ses').send_email(
+            Source=sender_email,
+            Destination={'ToAddresses': [to_address]},
+            Message={
+                'Subject': {'Data': subject},
+                'Body': {'Text': {'Data': body}}
+            }
+        )
+
+
+class StubEmailSender:
+    # Used locally and in tests: keeps the emails instead of sending them
+    def __init__(self):
+        self.sent = []
+
+    def send(self, to_address, subject, body):
+        self.sent.append({'to': to_address, 'subject': subject, 'body': body})
+        print(f"Email to {to_address}: {subject}")
+
+
+email_sender = StubEmailSender() if email_backend == 'stub' else SesEmailSender()
+
 
 def process_sqs_message(event, context):
-    print(event)
-    return event
+    records = event.get('Records', [])
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        outcomes = list(executor.map(process_record_safely, records))
+
+    # Only the failed records go back to the queue; store_quiz_history is idempotent per submissionId,
+    # and a redelivered result is not emailed again
+    return {
+        'batchItemFailures': [
+            {'itemIdentifier': record['messageId']}
+            for record, succeeded in zip(records, outcomes) if not succeeded
+        ]
+    }
+
+
+def process_record_safely(record):
+    try:
+        process_record(record)
+        return True
+    except Exception as e:
+        print(f"Error processing message {record.get('messageId')}: {str(e)}")
+        return False
+
+
+def process_record(record):
+    message = parse_message(record)
+
+    stored = True
+    if message.get('type') == 'quizResult':
+        stored = store_quiz_history(message['userId'], message['quizId'], message['scorePercentage'],
+                                    message['status'], message['correctAnswers'], message['totalQuestions'],
+                                    message['notAnsweredOrFalse'], message['results'], message['submissionId'])
+
+    # A redelivered result was already stored and its candidate already emailed
+    if message.get('message') and stored:
+        notify_user(message.get('userId'), message['message'])
+
+
+def parse_message(record):
+    # Messages arrive from SNS wrapped in its notification envelope
+    body = json.loads(record['body'])
+    if body.get('Type') == 'Notification':
+        return json.loads(body['Message'])
+    return body
+
+
+def notify_user(user_id, text):
+    if user_id is None:
+        print(f"Notification without recipient: {text}")
+        return
+
+    user = get_user_contact(user_id)
+    if not user:
+        print(f"User {user_id} not found, notification dropped.")
+        return
+
+    email_sender.send(user['email'], 'Your TeamQuiz result', f"Hello {user['firstName']},\n\n{text}")
+
+
+def get_user_contact(user_id):
+    try:
+        response = execute_statement(
+            sql="SELECT email, firstName FROM User WHERE userId = :userId",
+            parameters=[
+                {'name': 'userId', 'value': {'longValue': user_id}}
+            ]
+        )
+        records = response['records']
+        if not records:
+            return None
+        return {
+            'email': records[0][0]['stringValue'],
+            'firstName': records[0][1]['stringValue']
+        }
+    except Exception as e:
+        print(f"Error retrieving user contact: {str(e)}")
+        raise
@@ -41,9 +41,14 @@ CREATE TABLE Quiz (
     jobId INT NOT NULL,
     questionIds JSON NOT NULL,
     createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    userId INT NOT NULL,
+    userId INT NULL,
     timer INT  NOT NULL,
     numberQuestions INT NOT NULL,
+    answerKey JSON,
+    startedAt TIMESTAMP NULL,
+    expiresAt TIMESTAMP NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'open',
+    claimToken VARCHAR(36) NULL,
     FOREIGN KEY (profileId) REFERENCES Profile(profileId) ON DELETE SET NULL,
     FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE SET NULL,
     FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE SET NULL
@@ -57,6 +62,7 @@ CREATE TABLE Questions (
     type VARCHAR(50),
     options JSON,
     answer JSON,
+    payloadVersion VARCHAR(16) NULL,
     createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (profileId) REFERENCES Profile(profileId) ON DELETE SET NULL
@@ -70,6 +76,7 @@ CREATE TABLE Resume (
     resumeUrl VARCHAR(255),
     uploadedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uniqueUserJob (userId, jobId),
     FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE,
     FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE SET NULL
 );
@@ -100,6 +107,73 @@ CREATE TABLE QuizHistory (
     scorePercentage DECIMAL(5, 2),
     notAnsweredOrFalse INT,
     results JSON,
+    submissionId VARCHAR(64) UNIQUE,
     FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE,
     FOREIGN KEY (quizId) REFERENCES Quiz(id) ON DELETE CASCADE
 );
+
+-- Secondary indexes for hot handler queries
+CREATE INDEX idxQuestionsProfileType ON Questions (profileId, type);
+CREATE INDEX idxQuizHistoryUserQuiz ON QuizHistory (userId, quizId);
+CREATE INDEX idxQuizHistoryQuizDate ON QuizHistory (quizId, date);
+CREATE INDEX idxApplicationJob ON Application (jobId, submittedAt);
+CREATE UNIQUE INDEX uniqueApplicationUserJob ON Application (userId, jobId);
+CREATE INDEX idxQuizStatusExpires ON Quiz (status, expiresAt);
+CREATE UNIQUE INDEX uniqueQuizClaimToken ON Quiz (claimToken);
+CREATE INDEX idxQuizPool ON Quiz (status, profileId, jobId, numberQuestions);
+
+-- Create QuizQuestion Table
+CREATE TABLE QuizQuestion (
+    quizId INT NOT NULL,
+    position INT NOT NULL,
+    questionId INT NOT NULL,
+    PRIMARY KEY (quizId, position),
+    INDEX idxQuizQuestionQuestion (questionId),
+    FOREIGN KEY (quizId) REFERENCES Quiz(id) ON DELETE CASCADE
+);
+
+-- Create JobRanking Table (best score per candidate per job, maintained from QuizHistory)
+CREATE TABLE JobRanking (
+    jobId INT NOT NULL,
+    userId INT NOT NULL,
+    bestScore DECIMAL(5, 2) NOT NULL,
+    attempts INT NOT NULL,
+    lastAttemptAt TIMESTAMP NULL,
+    PRIMARY KEY (jobId, userId),
+    INDEX idxJobRankingScore (jobId, bestScore, userId),
+    FOREIGN KEY (jobId) REFERENCES Job(jobId) ON DELETE CASCADE,
+    FOREIGN KEY (userId) REFERENCES User(userId) ON DELETE CASCADE
+);
+
+-- Create QuestionStats Table (running per-question counters, maintained from graded results)
+CREATE TABLE QuestionStats (
+    questionId INT PRIMARY KEY,
+    timesServed INT NOT NULL DEFAULT 0,
+    timesAnswered INT NOT NULL DEFAULT 0,
+    timesCorrect INT NOT NULL DEFAULT 0,
+    totalCredit DOUBLE NOT NULL DEFAULT 0,
+    timedAnswers INT NOT NULL DEFAULT 0,
+    totalAnswerSeconds DOUBLE NOT NULL DEFAULT 0,
+    updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Archive Tables (duplicates moved aside by migrations before a unique key was added)
+CREATE TABLE ResumeArchive (
+    resumeId INT PRIMARY KEY,
+    userId INT,
+    jobId INT,
+    resumeUrl VARCHAR(255),
+    uploadedAt TIMESTAMP NULL,
+    updatedAt TIMESTAMP NULL,
+    archivedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE ApplicationArchive (
+    applicationId INT PRIMARY KEY,
+    userId INT,
+    jobId INT,
+    resumeId INT,
+    status VARCHAR(100),
+    submittedAt TIMESTAMP NULL,
+    archivedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);